@@ -1,25 +1,54 @@
 from __future__ import annotations
 
+import bisect
+import functools
+import hashlib
+import html
 import io
-import os
+import sys
+from collections import Counter
+from collections.abc import Mapping
+from types import MappingProxyType
 
-import ezdxf
-from ezdxf import bbox as ezdxf_bbox
-import numpy as np
 import streamlit as st
 import streamlit.components.v1 as st_components
-import trimesh
 
-st.set_page_config(page_title="CAD File Profiler", layout="centered")
+# The browser keeps the page config for the life of the session, so only
+# the first run of each session needs to send it.
+if "_booted" not in st.session_state:
+    st.set_page_config(page_title="CAD File Profiler", layout="centered")
+    st.session_state["_booted"] = True
 
 
-def _scroll_to_top() -> None:
-    """Inject JS to reset scroll position when switching pages."""
-    st_components.html(
-        "<script>window.parent.document.querySelector('section.main')"
-        ".scrollTo(0, 0);</script>",
-        height=0,
-    )
+@functools.lru_cache(maxsize=1)
+def _get_trimesh():
+    """Import trimesh on first mesh parse (it pulls in scipy/networkx)."""
+    import trimesh
+
+    return trimesh
+
+
+@functools.lru_cache(maxsize=1)
+def _get_ezdxf():
+    """Import ezdxf and its bbox module on first DXF parse."""
+    import ezdxf
+    from ezdxf import bbox
+
+    return ezdxf, bbox
+
+
+_SCROLL_JS = (
+    "<script>window.parent.document.querySelector('section.main')"
+    ".scrollTo(0, 0);</script>"
+)
+
+
+def _scroll_to_top(page: str) -> None:
+    """Inject JS to reset scroll position, only when the page has changed."""
+    if st.session_state.get("_last_page") == page:
+        return
+    st.session_state["_last_page"] = page
+    st_components.html(_SCROLL_JS, height=0)
 
 
 # Canonical extension per format (true aliases only, e.g. .stp -> .step)
@@ -28,342 +57,724 @@ EXTENSION_TO_FORMAT = {
     ".igs": ".iges",
 }
 
-FORMAT_KB = {
-    ".step": {
-        "label": "Neutral Solid (STEP)",
-        "geometry_class": "B-Rep",
-        "typical_authoring_tools": ["Any major CAD system"],
-        "common_use_cases": [
-            "Supplier deliverables",
-            "Design handoff",
-            "Quoting and tooling",
-        ],
-        "survives": ["Exact B-rep", "Assemblies", "Names/attributes"],
-        "lost": ["Parametric history", "Sketch constraints"],
-        "dfm_quote_confidence": "High",
-        "quote_risk_baseline": "Low",
-        "automation_friendliness": "High",
-        "notes": ["ISO 10303.", "Preferred for quoting and tooling."],
-    },
-    ".iges": {
-        "label": "Neutral Surface/Solid (IGES)",
-        "geometry_class": "Surface",
-        "typical_authoring_tools": [
-            "Legacy CAD systems",
-            "Aerospace supply chain tools",
-        ],
-        "common_use_cases": ["2D/3D mix", "Legacy exchange", "Surface-heavy data"],
-        "survives": ["Surfaces and solids", "Basic topology"],
-        "lost": ["Tight tolerances", "Parametric history", "Some assembly context"],
-        "dfm_quote_confidence": "Medium",
-        "quote_risk_baseline": "Medium",
-        "automation_friendliness": "Medium",
-        "notes": [
-            "Older standard; STEP preferred when possible.",
-            "Solids are possible but surface-only exports are common.",
-            "Geometry healing may be required before machining.",
-        ],
-    },
-    ".stl": {
-        "label": "Mesh (STL)",
-        "geometry_class": "Mesh",
-        "typical_authoring_tools": [
-            "Any CAD with STL export",
-            "Scan/reverse-engineering tools",
-        ],
-        "common_use_cases": [
-            "Scan data",
-            "Quick visualization exports",
-            "Reverse-engineered geometry",
-        ],
-        "survives": ["Triangulated surface", "Envelope shape"],
-        "lost": ["Exact geometry", "Edges/faces", "Units sometimes ambiguous"],
-        "dfm_quote_confidence": "Low",
-        "quote_risk_baseline": "High",
-        "automation_friendliness": "Medium",
-        "notes": [
-            "Check units (mm vs in).",
-            "Not suitable for CNC machining quote alone.",
-            "Lacks exact B-rep geometry; reverse engineering may be needed.",
-        ],
-    },
-    ".obj": {
-        "label": "Mesh (OBJ)",
-        "geometry_class": "Mesh",
-        "typical_authoring_tools": [
-            "Blender",
-            "Maya",
-            "Scan pipelines",
-            "Game engines",
-        ],
-        "common_use_cases": ["Visualization", "Games", "Appearance models"],
-        "survives": ["Triangulated mesh", "UVs / materials"],
-        "lost": ["Precise CAD geometry", "Units"],
-        "dfm_quote_confidence": "Low",
-        "quote_risk_baseline": "High",
-        "automation_friendliness": "Medium",
-        "notes": ["Often used for appearance, not engineering."],
-    },
-    ".sldprt": {
-        "label": "SolidWorks Part",
-        "geometry_class": "Parametric",
-        "typical_authoring_tools": ["SolidWorks"],
-        "common_use_cases": ["Supplier parts", "Design in-house", "Detailing"],
-        "survives": ["Full feature tree", "Parameters", "Materials"],
-        "lost": ["Nothing when opened in SolidWorks"],
-        "dfm_quote_confidence": "High",
-        "quote_risk_baseline": "Medium",
-        "automation_friendliness": "High",
-        "notes": [
-            "Risk depends on access to SolidWorks; file cannot be opened without it.",
-            "Export to STEP is recommended for CNC quoting workflows.",
-        ],
-    },
-    ".sldasm": {
-        "label": "SolidWorks Assembly",
-        "geometry_class": "Parametric",
-        "typical_authoring_tools": ["SolidWorks"],
-        "common_use_cases": ["Assembly design", "BOM", "Large assemblies"],
-        "survives": ["Structure", "mates", "parts"],
-        "lost": ["Nothing when opened in SolidWorks"],
-        "dfm_quote_confidence": "High",
-        "quote_risk_baseline": "Medium",
-        "automation_friendliness": "High",
-        "notes": [
-            "Risk depends on access to SolidWorks; file cannot be opened without it.",
-            "Export to STEP is recommended for CNC quoting workflows.",
-        ],
-    },
-    ".prt": {
-        "label": "NX / Creo Native",
-        "geometry_class": "Parametric",
-        "typical_authoring_tools": ["Siemens NX", "PTC Creo"],
-        "common_use_cases": [
-            "Manufacturing CAD",
-            "High-end design",
-            "Enterprise parts",
-        ],
-        "survives": ["Full model in native system"],
-        "lost": ["Cross-platform; need same CAD to open"],
-        "dfm_quote_confidence": "Medium",
-        "quote_risk_baseline": "Medium",
-        "automation_friendliness": "High",
-        "notes": [
-            "Extension shared by NX and Creo; requires the correct native CAD to open reliably.",
-            "Export to STEP when the recipient's CAD system is unknown.",
-        ],
-    },
-    ".catpart": {
-        "label": "CATIA Part",
-        "geometry_class": "Parametric",
-        "typical_authoring_tools": ["CATIA V5", "CATIA V6 (3DEXPERIENCE)"],
-        "common_use_cases": ["Aerospace", "Automotive", "Large assembly design"],
-        "survives": ["Full part in CATIA"],
-        "lost": ["Cross-platform"],
-        "dfm_quote_confidence": "High",
-        "quote_risk_baseline": "Medium",
-        "automation_friendliness": "Medium",
-        "notes": [
-            "Risk depends on access to CATIA; file cannot be opened without it.",
-            "Export to STEP is recommended for CNC quoting workflows.",
-        ],
-    },
-    ".dwg": {
-        "label": "AutoCAD Native (2D/3D)",
-        "geometry_class": "2D Drawing",
-        "typical_authoring_tools": ["AutoCAD", "DraftSight", "BricsCAD"],
-        "common_use_cases": ["Drafting", "Legacy drawings", "2D documentation"],
-        "survives": ["Drafting entities", "Blocks", "Layouts"],
-        "lost": ["Parametric 3D in some workflows"],
-        "dfm_quote_confidence": "Medium",
-        "quote_risk_baseline": "Medium",
-        "automation_friendliness": "High",
-        "notes": ["Often used for 2D drawings; 3D possible."],
-    },
-    ".dxf": {
-        "label": "Drawing Exchange Format (2D)",
-        "geometry_class": "2D Drawing",
-        "typical_authoring_tools": [
-            "AutoCAD",
-            "CNC nesting software",
-            "CAM software",
-        ],
-        "common_use_cases": [
-            "CNC profile layouts",
-            "Fixture and jig drawings",
-            "2D CAM",
-            "Drawing exchange",
-        ],
-        "survives": ["Lines, arcs", "Blocks", "Layers"],
-        "lost": ["Proprietary objects", "Full fidelity"],
-        "dfm_quote_confidence": "Medium",
-        "quote_risk_baseline": "Medium",
-        "automation_friendliness": "High",
-        "notes": ["Good for 2D CAM and CNC profile work."],
-    },
-}
 
-# Plain-English "What this file is" for Learn — Formats field guide (2–4 sentences).
-FORMAT_WHAT_THIS_IS: dict[str, str] = {
-    ".step": (
-        "STEP is an ISO standard exchange format for 3D product data. "
-        "It carries exact boundary-representation (B-rep) geometry: surfaces, "
-        "edges, and topology that CAM and inspection software can use directly. "
-        "For CNC quoting it is the preferred neutral format because it preserves "
-        "design intent without requiring the original CAD system."
-    ),
-    ".iges": (
-        "IGES is an older neutral format that can represent both surfaces and "
-        "solids. Many legacy and aerospace systems still export it. "
-        "Quality varies: surface-only exports are common, and geometry may need "
-        "healing before machining. STEP is preferred when the sender can provide it."
-    ),
-    ".stl": (
-        "STL is a mesh format: the model is stored as a cloud of triangles with "
-        "no exact curves or edges. It is widely used for 3D printing and quick "
-        "exports. For CNC machining it is problematic because units are often "
-        "ambiguous (mm vs in) and the triangulated surface is not suitable for "
-        "precision toolpaths without conversion or reverse engineering."
-    ),
-    ".obj": (
-        "OBJ is a mesh format common in animation and visualization (Blender, "
-        "Maya, game engines). It can carry UVs and materials but rarely carries "
-        "engineering units or precise CAD geometry. For CNC intake it shares "
-        "the same drawbacks as STL: no B-rep, unclear units, and limited use "
-        "for direct machining."
-    ),
-    ".sldprt": (
-        "A SolidWorks part file contains the full parametric model: features, "
-        "sketches, and history. It can only be opened in SolidWorks. "
-        "For CNC quoting the risk is access: if the recipient does not have "
-        "SolidWorks, they cannot inspect or re-export the geometry. Exporting to "
-        "STEP is the standard workaround for neutral handoff."
-    ),
-    ".sldasm": (
-        "A SolidWorks assembly file references multiple parts and stores mates "
-        "and assembly structure. Like .sldprt it is native to SolidWorks only. "
-        "For intake the same rule applies: without SolidWorks the file cannot "
-        "be opened. Request a STEP export (or individual STEP parts) for "
-        "quoting and CAM."
-    ),
-    ".prt": (
-        "The .prt extension is shared by Siemens NX and PTC Creo. The file "
-        "contains a full native part model but is tied to the originating "
-        "system. Opening it requires the correct CAD license (NX or Creo). "
-        "For cross‑platform quoting, STEP is the safe choice."
-    ),
-    ".catpart": (
-        "A CATIA part file holds the complete part model in CATIA V5 or V6 "
-        "format. It can only be opened in CATIA. Common in aerospace and "
-        "automotive; for CNC quoting, suppliers without CATIA need a STEP "
-        "export to evaluate and program the part."
-    ),
-    ".dwg": (
-        "DWG is AutoCAD’s native format for 2D and 3D drawing data. It carries "
-        "drafting entities, blocks, and layouts and is widely used for "
-        "drawings and documentation. For CNC, 2D DWGs are often used for "
-        "profile or fixture work; 3D is possible but less common in "
-        "machining workflows."
-    ),
-    ".dxf": (
-        "DXF is a 2D (and limited 3D) exchange format built around lines, "
-        "arcs, circles, and polylines. It is the usual output for CNC nesting "
-        "and 2D CAM. Quality depends on how it was exported: splines and "
-        "complex entities may require conversion to arcs or polylines before "
-        "toolpath generation."
-    ),
-}
+def _freeze(obj):
+    """Recursively turn dicts into read-only mappings and lists into tuples.
+
+    Strings are interned so the vocabulary repeated across the tables
+    ("High", "Mesh", "geometry_class", ...) is stored once.
+    """
+    if isinstance(obj, str):
+        return sys.intern(obj)
+    if isinstance(obj, dict):
+        return MappingProxyType({_freeze(k): _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+def _md_bullets(items) -> str:
+    """Join items into a single markdown bullet list."""
+    return "\n".join(f"- {item}" for item in items)
+
+
+def _html_field(title: str, value: str) -> str:
+    """Render a bold label with its value underneath as an HTML fragment."""
+    return f"<p><strong>{html.escape(title)}</strong></p><p>{html.escape(value)}</p>"
+
+
+def _html_bullets(title: str, items) -> str:
+    """Render a bold heading over an HTML bullet list."""
+    return (
+        f"<p><strong>{html.escape(title)}</strong></p><ul>"
+        + "".join(f"<li>{html.escape(item)}</li>" for item in items)
+        + "</ul>"
+    )
+
+
+def _html_columns(*cells: str) -> str:
+    """Lay HTML fragments out side by side, wrapping on narrow screens."""
+    body = "".join(f'<div style="flex:1 1 16rem">{cell}</div>' for cell in cells)
+    return f'<div style="display:flex;flex-wrap:wrap;gap:2rem">{body}</div>'
+
+
+def _html_bullet_columns(*columns: tuple[str, list[str]]) -> str:
+    """Render (title, items) pairs as side-by-side HTML bullet lists."""
+    return _html_columns(*(_html_bullets(title, items) for title, items in columns))
+
+
+@st.cache_resource
+def _load_kb() -> dict[str, Mapping]:
+    """Build the static knowledge base once per process.
+
+    Streamlit re-executes this script on every interaction, so the large
+    literal tables live here and are returned frozen (read-only mappings and
+    tuples) to keep the shared cached objects safe from mutation.
+    """
+    format_kb: dict[str, dict] = {
+        ".step": {
+            "label": "Neutral Solid (STEP)",
+            "geometry_class": "B-Rep",
+            "typical_authoring_tools": ["Any major CAD system"],
+            "common_use_cases": [
+                "Supplier deliverables",
+                "Design handoff",
+                "Quoting and tooling",
+            ],
+            "survives": ["Exact B-rep", "Assemblies", "Names/attributes"],
+            "lost": ["Parametric history", "Sketch constraints"],
+            "dfm_quote_confidence": "High",
+            "quote_risk_baseline": "Low",
+            "automation_friendliness": "High",
+            "notes": ["ISO 10303.", "Preferred for quoting and tooling."],
+        },
+        ".iges": {
+            "label": "Neutral Surface/Solid (IGES)",
+            "geometry_class": "Surface",
+            "typical_authoring_tools": [
+                "Legacy CAD systems",
+                "Aerospace supply chain tools",
+            ],
+            "common_use_cases": ["2D/3D mix", "Legacy exchange", "Surface-heavy data"],
+            "survives": ["Surfaces and solids", "Basic topology"],
+            "lost": ["Tight tolerances", "Parametric history", "Some assembly context"],
+            "dfm_quote_confidence": "Medium",
+            "quote_risk_baseline": "Medium",
+            "automation_friendliness": "Medium",
+            "notes": [
+                "Older standard; STEP preferred when possible.",
+                "Solids are possible but surface-only exports are common.",
+                "Geometry healing may be required before machining.",
+            ],
+        },
+        ".stl": {
+            "label": "Mesh (STL)",
+            "geometry_class": "Mesh",
+            "typical_authoring_tools": [
+                "Any CAD with STL export",
+                "Scan/reverse-engineering tools",
+            ],
+            "common_use_cases": [
+                "Scan data",
+                "Quick visualization exports",
+                "Reverse-engineered geometry",
+            ],
+            "survives": ["Triangulated surface", "Envelope shape"],
+            "lost": ["Exact geometry", "Edges/faces", "Units sometimes ambiguous"],
+            "dfm_quote_confidence": "Low",
+            "quote_risk_baseline": "High",
+            "automation_friendliness": "Medium",
+            "notes": [
+                "Check units (mm vs in).",
+                "Not suitable for CNC machining quote alone.",
+                "Lacks exact B-rep geometry; reverse engineering may be needed.",
+            ],
+        },
+        ".obj": {
+            "label": "Mesh (OBJ)",
+            "geometry_class": "Mesh",
+            "typical_authoring_tools": [
+                "Blender",
+                "Maya",
+                "Scan pipelines",
+                "Game engines",
+            ],
+            "common_use_cases": ["Visualization", "Games", "Appearance models"],
+            "survives": ["Triangulated mesh", "UVs / materials"],
+            "lost": ["Precise CAD geometry", "Units"],
+            "dfm_quote_confidence": "Low",
+            "quote_risk_baseline": "High",
+            "automation_friendliness": "Medium",
+            "notes": ["Often used for appearance, not engineering."],
+        },
+        ".sldprt": {
+            "label": "SolidWorks Part",
+            "geometry_class": "Parametric",
+            "typical_authoring_tools": ["SolidWorks"],
+            "common_use_cases": ["Supplier parts", "Design in-house", "Detailing"],
+            "survives": ["Full feature tree", "Parameters", "Materials"],
+            "lost": ["Nothing when opened in SolidWorks"],
+            "dfm_quote_confidence": "High",
+            "quote_risk_baseline": "Medium",
+            "automation_friendliness": "High",
+            "notes": [
+                "Risk depends on access to SolidWorks; file cannot be opened without it.",
+                "Export to STEP is recommended for CNC quoting workflows.",
+            ],
+        },
+        ".sldasm": {
+            "label": "SolidWorks Assembly",
+            "geometry_class": "Parametric",
+            "typical_authoring_tools": ["SolidWorks"],
+            "common_use_cases": ["Assembly design", "BOM", "Large assemblies"],
+            "survives": ["Structure", "mates", "parts"],
+            "lost": ["Nothing when opened in SolidWorks"],
+            "dfm_quote_confidence": "High",
+            "quote_risk_baseline": "Medium",
+            "automation_friendliness": "High",
+            "notes": [
+                "Risk depends on access to SolidWorks; file cannot be opened without it.",
+                "Export to STEP is recommended for CNC quoting workflows.",
+            ],
+        },
+        ".prt": {
+            "label": "NX / Creo Native",
+            "geometry_class": "Parametric",
+            "typical_authoring_tools": ["Siemens NX", "PTC Creo"],
+            "common_use_cases": [
+                "Manufacturing CAD",
+                "High-end design",
+                "Enterprise parts",
+            ],
+            "survives": ["Full model in native system"],
+            "lost": ["Cross-platform; need same CAD to open"],
+            "dfm_quote_confidence": "Medium",
+            "quote_risk_baseline": "Medium",
+            "automation_friendliness": "High",
+            "notes": [
+                "Extension shared by NX and Creo; requires the correct native CAD to open reliably.",
+                "Export to STEP when the recipient's CAD system is unknown.",
+            ],
+        },
+        ".catpart": {
+            "label": "CATIA Part",
+            "geometry_class": "Parametric",
+            "typical_authoring_tools": ["CATIA V5", "CATIA V6 (3DEXPERIENCE)"],
+            "common_use_cases": ["Aerospace", "Automotive", "Large assembly design"],
+            "survives": ["Full part in CATIA"],
+            "lost": ["Cross-platform"],
+            "dfm_quote_confidence": "High",
+            "quote_risk_baseline": "Medium",
+            "automation_friendliness": "Medium",
+            "notes": [
+                "Risk depends on access to CATIA; file cannot be opened without it.",
+                "Export to STEP is recommended for CNC quoting workflows.",
+            ],
+        },
+        ".dwg": {
+            "label": "AutoCAD Native (2D/3D)",
+            "geometry_class": "2D Drawing",
+            "typical_authoring_tools": ["AutoCAD", "DraftSight", "BricsCAD"],
+            "common_use_cases": ["Drafting", "Legacy drawings", "2D documentation"],
+            "survives": ["Drafting entities", "Blocks", "Layouts"],
+            "lost": ["Parametric 3D in some workflows"],
+            "dfm_quote_confidence": "Medium",
+            "quote_risk_baseline": "Medium",
+            "automation_friendliness": "High",
+            "notes": ["Often used for 2D drawings; 3D possible."],
+        },
+        ".dxf": {
+            "label": "Drawing Exchange Format (2D)",
+            "geometry_class": "2D Drawing",
+            "typical_authoring_tools": [
+                "AutoCAD",
+                "CNC nesting software",
+                "CAM software",
+            ],
+            "common_use_cases": [
+                "CNC profile layouts",
+                "Fixture and jig drawings",
+                "2D CAM",
+                "Drawing exchange",
+            ],
+            "survives": ["Lines, arcs", "Blocks", "Layers"],
+            "lost": ["Proprietary objects", "Full fidelity"],
+            "dfm_quote_confidence": "Medium",
+            "quote_risk_baseline": "Medium",
+            "automation_friendliness": "High",
+            "notes": ["Good for 2D CAM and CNC profile work."],
+        },
+    }
+
+    # Plain-English "What this file is" for Learn — Formats field guide (2–4 sentences).
+    what_this_is: dict[str, str] = {
+        ".step": (
+            "STEP is an ISO standard exchange format for 3D product data. "
+            "It carries exact boundary-representation (B-rep) geometry: surfaces, "
+            "edges, and topology that CAM and inspection software can use directly. "
+            "For CNC quoting it is the preferred neutral format because it preserves "
+            "design intent without requiring the original CAD system."
+        ),
+        ".iges": (
+            "IGES is an older neutral format that can represent both surfaces and "
+            "solids. Many legacy and aerospace systems still export it. "
+            "Quality varies: surface-only exports are common, and geometry may need "
+            "healing before machining. STEP is preferred when the sender can provide it."
+        ),
+        ".stl": (
+            "STL is a mesh format: the model is stored as a cloud of triangles with "
+            "no exact curves or edges. It is widely used for 3D printing and quick "
+            "exports. For CNC machining it is problematic because units are often "
+            "ambiguous (mm vs in) and the triangulated surface is not suitable for "
+            "precision toolpaths without conversion or reverse engineering."
+        ),
+        ".obj": (
+            "OBJ is a mesh format common in animation and visualization (Blender, "
+            "Maya, game engines). It can carry UVs and materials but rarely carries "
+            "engineering units or precise CAD geometry. For CNC intake it shares "
+            "the same drawbacks as STL: no B-rep, unclear units, and limited use "
+            "for direct machining."
+        ),
+        ".sldprt": (
+            "A SolidWorks part file contains the full parametric model: features, "
+            "sketches, and history. It can only be opened in SolidWorks. "
+            "For CNC quoting the risk is access: if the recipient does not have "
+            "SolidWorks, they cannot inspect or re-export the geometry. Exporting to "
+            "STEP is the standard workaround for neutral handoff."
+        ),
+        ".sldasm": (
+            "A SolidWorks assembly file references multiple parts and stores mates "
+            "and assembly structure. Like .sldprt it is native to SolidWorks only. "
+            "For intake the same rule applies: without SolidWorks the file cannot "
+            "be opened. Request a STEP export (or individual STEP parts) for "
+            "quoting and CAM."
+        ),
+        ".prt": (
+            "The .prt extension is shared by Siemens NX and PTC Creo. The file "
+            "contains a full native part model but is tied to the originating "
+            "system. Opening it requires the correct CAD license (NX or Creo). "
+            "For cross‑platform quoting, STEP is the safe choice."
+        ),
+        ".catpart": (
+            "A CATIA part file holds the complete part model in CATIA V5 or V6 "
+            "format. It can only be opened in CATIA. Common in aerospace and "
+            "automotive; for CNC quoting, suppliers without CATIA need a STEP "
+            "export to evaluate and program the part."
+        ),
+        ".dwg": (
+            "DWG is AutoCAD’s native format for 2D and 3D drawing data. It carries "
+            "drafting entities, blocks, and layouts and is widely used for "
+            "drawings and documentation. For CNC, 2D DWGs are often used for "
+            "profile or fixture work; 3D is possible but less common in "
+            "machining workflows."
+        ),
+        ".dxf": (
+            "DXF is a 2D (and limited 3D) exchange format built around lines, "
+            "arcs, circles, and polylines. It is the usual output for CNC nesting "
+            "and 2D CAM. Quality depends on how it was exported: splines and "
+            "complex entities may require conversion to arcs or polylines before "
+            "toolpath generation."
+        ),
+    }
 
-# Optional parentheticals for survives/lost bullets on Learn — Formats (canonical ext → survives|lost → item → note).
-FORMAT_BULLET_NOTES: dict[str, dict[str, dict[str, str]]] = {
-    ".step": {
-        "survives": {
-            "Exact B-rep": "precise surfaces and topology",
-            "Assemblies": "structure and placement",
-            "Names/attributes": "PMI and metadata where present",
+    # Optional parentheticals for survives/lost bullets on Learn — Formats (canonical ext → survives|lost → item → note).
+    bullet_notes: dict[str, dict[str, dict[str, str]]] = {
+        ".step": {
+            "survives": {
+                "Exact B-rep": "precise surfaces and topology",
+                "Assemblies": "structure and placement",
+                "Names/attributes": "PMI and metadata where present",
+            },
+            "lost": {"Parametric history": "feature tree and sketch constraints"},
+        },
+        ".iges": {
+            "survives": {
+                "Surfaces and solids": "depending on export",
+                "Basic topology": "may need healing",
+            },
+            "lost": {
+                "Tight tolerances": "often approximated",
+                "Parametric history": "not in IGES",
+                "Some assembly context": "structure can be flattened",
+            },
+        },
+        ".stl": {
+            "survives": {
+                "Triangulated surface": "triangle mesh only",
+                "Envelope shape": "outer shell",
+            },
+            "lost": {
+                "Exact geometry": "no curves or edges",
+                "Edges/faces": "replaced by facets",
+                "Units sometimes ambiguous": "mm vs in not encoded",
+            },
+        },
+        ".obj": {
+            "survives": {
+                "Triangulated mesh": "vertices and faces",
+                "UVs / materials": "for visualization",
+            },
+            "lost": {"Precise CAD geometry": "no B-rep", "Units": "not standardized"},
+        },
+        ".sldprt": {
+            "survives": {
+                "Full feature tree": "in SolidWorks only",
+                "Parameters": "dimensions and relations",
+                "Materials": "in the model",
+            },
+            "lost": {
+                "Nothing when opened in SolidWorks": "full fidelity in‑house only"
+            },
         },
-        "lost": {"Parametric history": "feature tree and sketch constraints"},
-    },
-    ".iges": {
-        "survives": {
-            "Surfaces and solids": "depending on export",
-            "Basic topology": "may need healing",
+        ".sldasm": {
+            "survives": {
+                "Structure": "assembly tree",
+                "mates": "constraints",
+                "parts": "references to .sldprt",
+            },
+            "lost": {
+                "Nothing when opened in SolidWorks": "cross‑platform requires STEP export"
+            },
         },
-        "lost": {
-            "Tight tolerances": "often approximated",
-            "Parametric history": "not in IGES",
-            "Some assembly context": "structure can be flattened",
+        ".prt": {
+            "survives": {"Full model in native system": "in NX or Creo only"},
+            "lost": {"Cross-platform; need same CAD to open": "STEP for handoff"},
         },
-    },
-    ".stl": {
-        "survives": {
-            "Triangulated surface": "triangle mesh only",
-            "Envelope shape": "outer shell",
+        ".catpart": {
+            "survives": {"Full part in CATIA": "in CATIA only"},
+            "lost": {"Cross-platform": "STEP for non‑CATIA shops"},
+        },
+        ".dwg": {
+            "survives": {
+                "Drafting entities": "lines, arcs, text, dimensions",
+                "Blocks": "reusable symbols",
+                "Layouts": "paper space",
+            },
+            "lost": {
+                "Parametric 3D in some workflows": "3D can be present but not always portable"
+            },
         },
-        "lost": {
-            "Exact geometry": "no curves or edges",
-            "Edges/faces": "replaced by facets",
-            "Units sometimes ambiguous": "mm vs in not encoded",
+        ".dxf": {
+            "survives": {
+                "Lines, arcs": "and circles, polylines",
+                "Blocks": "block definitions",
+                "Layers": "layer names and visibility",
+            },
+            "lost": {
+                "Proprietary objects": "custom entities may not translate",
+                "Full fidelity": "export options affect what is written",
+            },
         },
-    },
-    ".obj": {
-        "survives": {
-            "Triangulated mesh": "vertices and faces",
-            "UVs / materials": "for visualization",
+    }
+
+    material_kb: dict[str, dict] = {
+        "Aluminum — 6061-T6 (default)": {
+            "difficulty": "Low",
+            "machining_reality": (
+                "6061-T6 is the most forgiving CNC material in common use. It"
+                " shears cleanly, produces well-formed chips, and allows"
+                " aggressive feeds and speeds (SFM 800–1200+) with standard"
+                " uncoated or ZrN-coated carbide endmills. Tool life is"
+                ' excellent — a single 1/2" endmill can often run 200+ parts'
+                " before replacement. The material is thermally conductive, so"
+                " heat leaves through the chip rather than building at the"
+                " cutting edge, which means mist coolant or even dry cutting"
+                " is viable for many operations."
+            ),
+            "cost_drivers": [
+                "Very low tool wear — standard 2- or 3-flute carbide endmills last hundreds of parts",
+                "Fast cycle times: feeds of 80–150 IPM and full-slotting depths of 1×D are routine",
+                "Mist or flood coolant both work; no special coolant delivery needed",
+                "Low scrap risk — the material is ductile and forgiving of minor programming errors",
+                "Stock is cheap and widely available in plate, bar, and round",
+            ],
+            "quote_implications": [
+                "Straightforward quoting — cycle time estimates are reliable and tool cost is minimal",
+                "Confirm temper: T6 (general purpose) vs T651 (stress-relieved, better flatness for plates)",
+                "Anodize-ready surfaces need Ra 32–63 µin finish passes; factor in if cosmetic",
+                'Thin-wall features (<0.040") are achievable but may need reduced stepover and spring passes',
+            ],
         },
-        "lost": {"Precise CAD geometry": "no B-rep", "Units": "not standardized"},
-    },
-    ".sldprt": {
-        "survives": {
-            "Full feature tree": "in SolidWorks only",
-            "Parameters": "dimensions and relations",
-            "Materials": "in the model",
+        "Aluminum — 7075-T6": {
+            "difficulty": "Low",
+            "machining_reality": (
+                "7075-T6 is significantly harder and stronger than 6061 (UTS"
+                " ~83 ksi vs ~45 ksi) and machines at similar speeds, but it"
+                " is less forgiving under aggressive cuts. It produces shorter,"
+                " snappier chips and is more prone to residual-stress warping"
+                " in thin-wall or asymmetric parts. Hogging pockets in 7075"
+                " plate can release internal stresses that bow or twist the"
+                " part after unclamping — stress-relief cycles or alternating"
+                " roughing sides may be needed."
+            ),
+            "cost_drivers": [
+                "Tool wear ~20–30% higher than 6061; coated carbide (AlTiN) extends life at high speeds",
+                "Feeds and speeds comparable to 6061 (SFM 600–1000) but with slightly lower DOC limits",
+                "Residual stress is the hidden cost: thin-wall parts may need intermediate stress relief or flip roughing",
+                "Stock cost ~1.5–2× 6061; scrapping a large 7075 billet is a real financial hit",
+                "Chip evacuation is easier than 6061 (shorter chips) but chip-to-surface contact can gall soft tooling",
+            ],
+            "quote_implications": [
+                "Confirm temper and whether plate is pre-stretched (T7351) to reduce residual stress",
+                "Grain direction matters for aerospace — ask if orientation relative to rolling direction is specified",
+                "Material certs (mill certs) are typically required; AMS 4078 / AMS 4045 callouts are common",
+                "Ask about stress-relief strategy for thin-wall geometry — this can add ops and cycle time",
+            ],
         },
-        "lost": {"Nothing when opened in SolidWorks": "full fidelity in‑house only"},
-    },
-    ".sldasm": {
-        "survives": {
-            "Structure": "assembly tree",
-            "mates": "constraints",
-            "parts": "references to .sldprt",
+        "Steel — 1018 (low carbon)": {
+            "difficulty": "Medium",
+            "machining_reality": (
+                "1018 is soft (~Brinell 126, ~72 HRB) and ductile, which makes"
+                " it gummy rather than brittle. It produces long, stringy chips"
+                " that wrap around tooling and clog flutes if chip-breaking"
+                " geometry isn't used. Built-up edge (BUE) is common at low"
+                " cutting speeds — the material welds itself to the tool tip"
+                " and tears rather than shearing. Running faster (SFM 400–600)"
+                " with coated inserts and positive rake geometry reduces BUE"
+                " and improves finish. Compared to 4140, chip control is worse"
+                " and surface finish is harder to achieve, but tool wear is"
+                " lower and the material is very forgiving structurally."
+            ),
+            "cost_drivers": [
+                "Tool wear is moderate; BUE is the bigger threat — destroys finish before it destroys the tool",
+                "Cycle times ~2–3× aluminum: typical SFM 400–600 with carbide, lower with HSS",
+                "Flood coolant strongly recommended for chip evacuation and BUE prevention",
+                "Stringy chips can bird-nest on the tool or workpiece, causing surface damage and stoppages",
+                "Stock is cheap and widely available; scrap cost is low per unit weight",
+            ],
+            "quote_implications": [
+                "Ask if carburizing or case hardening is planned after machining — tolerances shift after heat treat",
+                "Surface finish expectations: 1018 doesn't take a good polish; Ra 63 µin is realistic, 32 µin is a fight",
+                "Confirm whether customer needs cold-rolled (1018 CF) vs hot-rolled — hardness and surface differ",
+                "Post-machining heat treat (normalize, carburize, Q&T) must be specified up front",
+            ],
         },
-        "lost": {
-            "Nothing when opened in SolidWorks": "cross‑platform requires STEP export"
+        "Steel — 4140 (alloy)": {
+            "difficulty": "Medium",
+            "machining_reality": (
+                "4140 is a step up from 1018 in every machining dimension."
+                " Pre-hard (28–32 HRC) it cuts cleanly with coated carbide,"
+                " breaks chips well, and produces a better surface finish than"
+                " low-carbon steel — the chromium–molybdenum alloy content"
+                " actually improves machinability over plain carbon grades."
+                " However, it generates more heat, wears tools faster, and the"
+                " cost jump to hardened 4140 (>40 HRC) is dramatic: tool life"
+                " drops by 50–70%, speeds must be halved, and ceramic or CBN"
+                " inserts may be needed."
+            ),
+            "cost_drivers": [
+                "Tool wear 1.5–2× that of 1018; coated carbide (TiAlN, AlCrN) is required, not optional",
+                "Cycle times ~3–4× aluminum in pre-hard condition; ~5–6× in hardened (>40 HRC) condition",
+                "Flood coolant is essential; through-spindle preferred for deep pockets and holes",
+                "Pre-hard vs annealed vs hardened condition fundamentally changes the quoting equation",
+                "Stock cost ~2× low-carbon steel; scrap is painful on large billets",
+            ],
+            "quote_implications": [
+                "Confirm exact hardness condition: annealed (~197 HB), pre-hard (28–32 HRC), or hardened (40+ HRC)",
+                "If hardened after machining, tolerances will shift — budget for finish grind on critical dims",
+                "Ask about Q&T (quench and temper) requirements — ASTM A829 and AMS 6382 are common callouts",
+                "Material certs are expected for structural, hydraulic, and oil/gas applications",
+            ],
         },
-    },
-    ".prt": {
-        "survives": {"Full model in native system": "in NX or Creo only"},
-        "lost": {"Cross-platform; need same CAD to open": "STEP for handoff"},
-    },
-    ".catpart": {
-        "survives": {"Full part in CATIA": "in CATIA only"},
-        "lost": {"Cross-platform": "STEP for non‑CATIA shops"},
-    },
-    ".dwg": {
-        "survives": {
-            "Drafting entities": "lines, arcs, text, dimensions",
-            "Blocks": "reusable symbols",
-            "Layouts": "paper space",
+        "Stainless Steel — 304/316": {
+            "difficulty": "High",
+            "machining_reality": (
+                "Austenitic stainless (304, 316) work-hardens aggressively:"
+                " every pass that rubs instead of shearing creates a thin,"
+                " glass-hard surface layer that dulls the next pass's cutting"
+                " edge. This means dull tools, light feeds, dwelling, and"
+                " re-cutting spring passes all make the problem worse. The fix"
+                " is sharp tools, rigid setups, aggressive chip loads (stay"
+                " above minimum chip thickness), and never letting the tool"
+                " rub. Tool life is roughly 1/3 to 1/4 of carbon steel at"
+                " equivalent feeds, and cycle times are 2–3× longer."
+            ),
+            "cost_drivers": [
+                "High tool wear from work hardening: expect tool life 1/3 to 1/4 of carbon steel",
+                "Cycle times 2–3× carbon steel — SFM 250–400 typical; slower still with interrupted cuts",
+                "Flood coolant is mandatory: the material's low thermal conductivity traps heat at the cut",
+                "Rigid workholding is critical — chatter causes rubbing, which triggers the work-hardening spiral",
+                "Scrap risk is elevated: a work-hardened surface layer can render a part unsalvageable",
+            ],
+            "quote_implications": [
+                "Confirm exact alloy: 304 (general) vs 316 (marine/chemical — slightly harder to machine)",
+                "Surface finish matters more here — work-hardened surfaces tear; Ra callouts must be explicit",
+                "Passivation (citric or nitric acid) is often required post-machining; electropolish adds more cost",
+                "Lead times run longer: slower cycle times and more frequent tool changes reduce daily throughput",
+            ],
         },
-        "lost": {
-            "Parametric 3D in some workflows": "3D can be present but not always portable"
+        "Titanium — Ti-6Al-4V": {
+            "difficulty": "Very High",
+            "machining_reality": (
+                "Ti-6Al-4V combines high strength (UTS ~130 ksi), very low"
+                " thermal conductivity (~1/6 of steel), and significant"
+                " springback. Because heat doesn't leave through the chip, it"
+                " concentrates at the tool tip — cutting-edge temperatures can"
+                " exceed 600 °C even at modest speeds, causing rapid crater"
+                " wear and edge breakdown. Springback means the material"
+                " deflects under the tool and then recovers, causing"
+                " under-cutting on thin walls and poor dimensional control."
+                " Expect cycle times 3–5× aluminum and tool life 1/5 to 1/10"
+                " of what you'd see in 6061."
+            ),
+            "cost_drivers": [
+                "Extreme tool wear driven by heat: tool life 1/5 to 1/10 of aluminum; premium coated carbide (AlTiN, nanocomposite) or PCD required",
+                "Very slow cycle times — SFM 100–200 typical; 3–5× aluminum for equivalent geometry",
+                "High-pressure through-spindle coolant (1000+ PSI) strongly recommended to manage cutting-edge heat",
+                "Springback causes dimensional drift on thin walls; multiple light finish passes or spring passes needed",
+                "Stock cost is very high ($15–40/lb for bar); a single scrapped billet can cost hundreds of dollars",
+            ],
+            "quote_implications": [
+                "Confirm grade (Grade 5 is Ti-6Al-4V) and condition: annealed, STA (solution treated and aged), or ELI (extra low interstitials for medical)",
+                "Material certs and full batch traceability are almost always required (AMS 4928, AMS 4911)",
+                "Ask about post-machining: chemical milling, shot peening, anodize, or PVD coatings are common in aerospace",
+                "Budget for significantly longer lead times and higher per-part cost — plan for 4–8× the cost of equivalent 6061 parts",
+            ],
         },
-    },
-    ".dxf": {
-        "survives": {
-            "Lines, arcs": "and circles, polylines",
-            "Blocks": "block definitions",
-            "Layers": "layer names and visibility",
+        "Inconel — 718": {
+            "difficulty": "Very High",
+            "machining_reality": (
+                "Inconel 718 is among the most punishing CNC materials."
+                " It work-hardens like stainless but worse, has even lower"
+                " thermal conductivity than titanium, and is highly abrasive"
+                " due to hard carbide particles in the microstructure. Cutting"
+                " temperatures routinely exceed 700 °C. Ceramic inserts can"
+                " rough at higher speeds (SFM 600–1000) but are brittle and"
+                " demand rigid, chatter-free setups. Carbide finishing at SFM"
+                " 70–120 is common. Tool life in Inconel is often measured in"
+                " minutes, not parts — a single roughing insert may last"
+                " 5–15 minutes of cut time."
+            ),
+            "cost_drivers": [
+                "Extreme tool wear: roughing inserts may last only 5–15 minutes of cutting time; ceramics needed for productivity",
+                "Very slow cycle times with carbide (SFM 70–120); ceramics are faster but require perfect rigidity and zero chatter",
+                "High-pressure coolant (1000+ PSI through spindle) is mandatory — inadequate coolant destroys tools in seconds",
+                "Cutting forces are very high; specialized high-clamp-force workholding and rigid, high-torque spindles are required",
+                "Stock cost is extreme ($30–80/lb); scrap is catastrophically expensive on large forgings or billets",
+            ],
+            "quote_implications": [
+                "Confirm alloy condition: solution annealed (~30 HRC), age-hardened (~40–44 HRC), or direct-aged — machining difficulty varies enormously",
+                "Material certs with full heat-lot traceability are mandatory (AMS 5662, AMS 5663)",
+                "Verify the shop has Inconel experience, ceramic tooling, and high-pressure coolant capability before committing",
+                "Expect cost and lead time 6–10× equivalent steel parts; fewer shops are qualified and capacity is limited",
+            ],
         },
-        "lost": {
-            "Proprietary objects": "custom entities may not translate",
-            "Full fidelity": "export options affect what is written",
+        "Other / Unknown": {
+            "difficulty": "Unknown",
+            "machining_reality": (
+                "Material is not specified. Without knowing the alloy, hardness,"
+                " and thermal properties, it is impossible to estimate tool wear"
+                " rates, cycle times, or coolant requirements. A quote without"
+                " a confirmed material is a guess — the difference between"
+                " machining 6061 aluminum and Inconel 718 is easily a 10×"
+                " cost multiplier on the same geometry."
+            ),
+            "cost_drivers": [
+                "Tool wear is unpredictable: a 10× range between easy aluminum and superalloys",
+                "Cycle time cannot be estimated — feeds, speeds, and depth of cut depend entirely on material",
+                "Coolant strategy (mist, flood, high-pressure TSC) depends on material thermal properties",
+                "Workholding forces and rigidity requirements scale with material hardness and cutting forces",
+                "Scrap risk is unquantifiable: material cost per pound ranges from $2 (aluminum) to $80 (Inconel)",
+            ],
+            "quote_implications": [
+                "Request exact material specification (alloy, grade, temper/condition) before quoting",
+                "Confirm hardness or heat treat state — this matters more than alloy name alone for machinability",
+                "Ask about any coatings, plating, or special post-machining processes",
+                "Without material, any quoted price is a placeholder — flag this to the customer explicitly",
+            ],
         },
-    },
-}
+    }
+
+    # (canonical ext, "survives" | "lost", item) → note, one lookup per bullet.
+    flat_notes = {
+        (ext, bucket, item): note
+        for ext, buckets in bullet_notes.items()
+        for bucket, items in buckets.items()
+        for item, note in items.items()
+    }
+
+    def annotated(ext: str, bucket: str, items: list[str]) -> list[str]:
+        return [
+            (
+                f"{item} ({flat_notes[ext, bucket, item]})"
+                if (ext, bucket, item) in flat_notes
+                else item
+            )
+            for item in items
+        ]
+
+    # Learn — Formats column blocks (heading + bullets), one st.markdown each.
+    learn_md = {
+        ext: {
+            "tools": "**Typical authoring tools**\n\n"
+            + _md_bullets(info["typical_authoring_tools"]),
+            "uses": "**Common use cases**\n\n" + _md_bullets(info["common_use_cases"]),
+            "survives": "**Survives**\n\n"
+            + _md_bullets(annotated(ext, "survives", info["survives"])),
+            "lost": "**Lost or at risk**\n\n"
+            + _md_bullets(annotated(ext, "lost", info["lost"])),
+        }
+        for ext, info in format_kb.items()
+    }
+
+    frozen_format = _freeze(format_kb)
+    # Every accepted extension (canonical or alias) → canonical format key.
+    canonical_ext = {ext: ext for ext in format_kb} | EXTENSION_TO_FORMAT
+    return {
+        "format": frozen_format,
+        "canonical_ext": _freeze(canonical_ext),
+        # Lowercase extension (aliases included) → format entry in one lookup.
+        "format_by_ext": MappingProxyType(
+            {ext: frozen_format[canonical] for ext, canonical in canonical_ext.items()}
+        ),
+        "what_this_is": _freeze(what_this_is),
+        "learn_md": _freeze(learn_md),
+        "material": _freeze(material_kb),
+    }
+
+
+KB = _load_kb()
+FORMAT_KB = KB["format"]
+FORMAT_WHAT_THIS_IS = KB["what_this_is"]
+LEARN_MD = KB["learn_md"]
+MATERIAL_KB = KB["material"]
+CANONICAL_EXT = KB["canonical_ext"]
+_FORMAT_BY_EXT = KB["format_by_ext"]
+
+
+@st.cache_resource
+def _render_kb() -> dict[str, Mapping]:
+    """Pre-render the KB's markdown and HTML blocks once per process.
+
+    Kept apart from _load_kb so the knowledge base itself stays plain data.
+    """
+    # Difficulty line + machining reality, and the two-column bullet block,
+    # so each material renders with two st.markdown calls.
+    material = {
+        name: {
+            "reality_md": (
+                f"**Difficulty:** {mat_info['difficulty']}\n\n"
+                f"{mat_info['machining_reality']}"
+            ),
+            "columns_html": _html_bullet_columns(
+                ("Cost drivers", mat_info["cost_drivers"]),
+                ("Quote implications", mat_info["quote_implications"]),
+            ),
+        }
+        for name, mat_info in MATERIAL_KB.items()
+    }
+    # Analyze summary-card columns as HTML fragments. The right column is
+    # split around the slot where the context-adjusted risk row goes.
+    card = {
+        ext: {
+            "left_html": _html_field("Geometry class", info["geometry_class"])
+            + "".join(
+                _html_bullets(heading, info[field])
+                for field, heading in (
+                    ("typical_authoring_tools", "Typical authoring tools"),
+                    ("common_use_cases", "Common use cases"),
+                    ("survives", "Survives export"),
+                    ("lost", "Lost / at risk"),
+                )
+            ),
+            "right_html": (
+                _html_field("DFM / quote confidence", info["dfm_quote_confidence"])
+                + _html_field("Quote risk baseline", info["quote_risk_baseline"]),
+                _html_field("Automation friendliness", info["automation_friendliness"])
+                + _html_bullets("Notes", info["notes"]),
+            ),
+        }
+        for ext, info in FORMAT_KB.items()
+    }
+    return {"material": _freeze(material), "card": _freeze(card)}
+
+
+RENDERED = _render_kb()
+MATERIAL_RENDERED = RENDERED["material"]
+CARD_RENDERED = RENDERED["card"]
 
 
-MATERIALS = [
+MATERIALS = (
     "Aluminum — 6061-T6 (default)",
     "Aluminum — 7075-T6",
     "Steel — 1018 (low carbon)",
@@ -372,258 +783,26 @@ MATERIALS = [
     "Titanium — Ti-6Al-4V",
     "Inconel — 718",
     "Other / Unknown",
-]
-
-
-MATERIAL_KB: dict[str, dict] = {
-    "Aluminum — 6061-T6 (default)": {
-        "difficulty": "Low",
-        "machining_reality": (
-            "6061-T6 is the most forgiving CNC material in common use. It"
-            " shears cleanly, produces well-formed chips, and allows"
-            " aggressive feeds and speeds (SFM 800–1200+) with standard"
-            " uncoated or ZrN-coated carbide endmills. Tool life is"
-            ' excellent — a single 1/2" endmill can often run 200+ parts'
-            " before replacement. The material is thermally conductive, so"
-            " heat leaves through the chip rather than building at the"
-            " cutting edge, which means mist coolant or even dry cutting"
-            " is viable for many operations."
-        ),
-        "cost_drivers": [
-            "Very low tool wear — standard 2- or 3-flute carbide endmills last hundreds of parts",
-            "Fast cycle times: feeds of 80–150 IPM and full-slotting depths of 1×D are routine",
-            "Mist or flood coolant both work; no special coolant delivery needed",
-            "Low scrap risk — the material is ductile and forgiving of minor programming errors",
-            "Stock is cheap and widely available in plate, bar, and round",
-        ],
-        "quote_implications": [
-            "Straightforward quoting — cycle time estimates are reliable and tool cost is minimal",
-            "Confirm temper: T6 (general purpose) vs T651 (stress-relieved, better flatness for plates)",
-            "Anodize-ready surfaces need Ra 32–63 µin finish passes; factor in if cosmetic",
-            'Thin-wall features (<0.040") are achievable but may need reduced stepover and spring passes',
-        ],
-    },
-    "Aluminum — 7075-T6": {
-        "difficulty": "Low",
-        "machining_reality": (
-            "7075-T6 is significantly harder and stronger than 6061 (UTS"
-            " ~83 ksi vs ~45 ksi) and machines at similar speeds, but it"
-            " is less forgiving under aggressive cuts. It produces shorter,"
-            " snappier chips and is more prone to residual-stress warping"
-            " in thin-wall or asymmetric parts. Hogging pockets in 7075"
-            " plate can release internal stresses that bow or twist the"
-            " part after unclamping — stress-relief cycles or alternating"
-            " roughing sides may be needed."
-        ),
-        "cost_drivers": [
-            "Tool wear ~20–30% higher than 6061; coated carbide (AlTiN) extends life at high speeds",
-            "Feeds and speeds comparable to 6061 (SFM 600–1000) but with slightly lower DOC limits",
-            "Residual stress is the hidden cost: thin-wall parts may need intermediate stress relief or flip roughing",
-            "Stock cost ~1.5–2× 6061; scrapping a large 7075 billet is a real financial hit",
-            "Chip evacuation is easier than 6061 (shorter chips) but chip-to-surface contact can gall soft tooling",
-        ],
-        "quote_implications": [
-            "Confirm temper and whether plate is pre-stretched (T7351) to reduce residual stress",
-            "Grain direction matters for aerospace — ask if orientation relative to rolling direction is specified",
-            "Material certs (mill certs) are typically required; AMS 4078 / AMS 4045 callouts are common",
-            "Ask about stress-relief strategy for thin-wall geometry — this can add ops and cycle time",
-        ],
-    },
-    "Steel — 1018 (low carbon)": {
-        "difficulty": "Medium",
-        "machining_reality": (
-            "1018 is soft (~Brinell 126, ~72 HRB) and ductile, which makes"
-            " it gummy rather than brittle. It produces long, stringy chips"
-            " that wrap around tooling and clog flutes if chip-breaking"
-            " geometry isn't used. Built-up edge (BUE) is common at low"
-            " cutting speeds — the material welds itself to the tool tip"
-            " and tears rather than shearing. Running faster (SFM 400–600)"
-            " with coated inserts and positive rake geometry reduces BUE"
-            " and improves finish. Compared to 4140, chip control is worse"
-            " and surface finish is harder to achieve, but tool wear is"
-            " lower and the material is very forgiving structurally."
-        ),
-        "cost_drivers": [
-            "Tool wear is moderate; BUE is the bigger threat — destroys finish before it destroys the tool",
-            "Cycle times ~2–3× aluminum: typical SFM 400–600 with carbide, lower with HSS",
-            "Flood coolant strongly recommended for chip evacuation and BUE prevention",
-            "Stringy chips can bird-nest on the tool or workpiece, causing surface damage and stoppages",
-            "Stock is cheap and widely available; scrap cost is low per unit weight",
-        ],
-        "quote_implications": [
-            "Ask if carburizing or case hardening is planned after machining — tolerances shift after heat treat",
-            "Surface finish expectations: 1018 doesn't take a good polish; Ra 63 µin is realistic, 32 µin is a fight",
-            "Confirm whether customer needs cold-rolled (1018 CF) vs hot-rolled — hardness and surface differ",
-            "Post-machining heat treat (normalize, carburize, Q&T) must be specified up front",
-        ],
-    },
-    "Steel — 4140 (alloy)": {
-        "difficulty": "Medium",
-        "machining_reality": (
-            "4140 is a step up from 1018 in every machining dimension."
-            " Pre-hard (28–32 HRC) it cuts cleanly with coated carbide,"
-            " breaks chips well, and produces a better surface finish than"
-            " low-carbon steel — the chromium–molybdenum alloy content"
-            " actually improves machinability over plain carbon grades."
-            " However, it generates more heat, wears tools faster, and the"
-            " cost jump to hardened 4140 (>40 HRC) is dramatic: tool life"
-            " drops by 50–70%, speeds must be halved, and ceramic or CBN"
-            " inserts may be needed."
-        ),
-        "cost_drivers": [
-            "Tool wear 1.5–2× that of 1018; coated carbide (TiAlN, AlCrN) is required, not optional",
-            "Cycle times ~3–4× aluminum in pre-hard condition; ~5–6× in hardened (>40 HRC) condition",
-            "Flood coolant is essential; through-spindle preferred for deep pockets and holes",
-            "Pre-hard vs annealed vs hardened condition fundamentally changes the quoting equation",
-            "Stock cost ~2× low-carbon steel; scrap is painful on large billets",
-        ],
-        "quote_implications": [
-            "Confirm exact hardness condition: annealed (~197 HB), pre-hard (28–32 HRC), or hardened (40+ HRC)",
-            "If hardened after machining, tolerances will shift — budget for finish grind on critical dims",
-            "Ask about Q&T (quench and temper) requirements — ASTM A829 and AMS 6382 are common callouts",
-            "Material certs are expected for structural, hydraulic, and oil/gas applications",
-        ],
-    },
-    "Stainless Steel — 304/316": {
-        "difficulty": "High",
-        "machining_reality": (
-            "Austenitic stainless (304, 316) work-hardens aggressively:"
-            " every pass that rubs instead of shearing creates a thin,"
-            " glass-hard surface layer that dulls the next pass's cutting"
-            " edge. This means dull tools, light feeds, dwelling, and"
-            " re-cutting spring passes all make the problem worse. The fix"
-            " is sharp tools, rigid setups, aggressive chip loads (stay"
-            " above minimum chip thickness), and never letting the tool"
-            " rub. Tool life is roughly 1/3 to 1/4 of carbon steel at"
-            " equivalent feeds, and cycle times are 2–3× longer."
-        ),
-        "cost_drivers": [
-            "High tool wear from work hardening: expect tool life 1/3 to 1/4 of carbon steel",
-            "Cycle times 2–3× carbon steel — SFM 250–400 typical; slower still with interrupted cuts",
-            "Flood coolant is mandatory: the material's low thermal conductivity traps heat at the cut",
-            "Rigid workholding is critical — chatter causes rubbing, which triggers the work-hardening spiral",
-            "Scrap risk is elevated: a work-hardened surface layer can render a part unsalvageable",
-        ],
-        "quote_implications": [
-            "Confirm exact alloy: 304 (general) vs 316 (marine/chemical — slightly harder to machine)",
-            "Surface finish matters more here — work-hardened surfaces tear; Ra callouts must be explicit",
-            "Passivation (citric or nitric acid) is often required post-machining; electropolish adds more cost",
-            "Lead times run longer: slower cycle times and more frequent tool changes reduce daily throughput",
-        ],
-    },
-    "Titanium — Ti-6Al-4V": {
-        "difficulty": "Very High",
-        "machining_reality": (
-            "Ti-6Al-4V combines high strength (UTS ~130 ksi), very low"
-            " thermal conductivity (~1/6 of steel), and significant"
-            " springback. Because heat doesn't leave through the chip, it"
-            " concentrates at the tool tip — cutting-edge temperatures can"
-            " exceed 600 °C even at modest speeds, causing rapid crater"
-            " wear and edge breakdown. Springback means the material"
-            " deflects under the tool and then recovers, causing"
-            " under-cutting on thin walls and poor dimensional control."
-            " Expect cycle times 3–5× aluminum and tool life 1/5 to 1/10"
-            " of what you'd see in 6061."
-        ),
-        "cost_drivers": [
-            "Extreme tool wear driven by heat: tool life 1/5 to 1/10 of aluminum; premium coated carbide (AlTiN, nanocomposite) or PCD required",
-            "Very slow cycle times — SFM 100–200 typical; 3–5× aluminum for equivalent geometry",
-            "High-pressure through-spindle coolant (1000+ PSI) strongly recommended to manage cutting-edge heat",
-            "Springback causes dimensional drift on thin walls; multiple light finish passes or spring passes needed",
-            "Stock cost is very high ($15–40/lb for bar); a single scrapped billet can cost hundreds of dollars",
-        ],
-        "quote_implications": [
-            "Confirm grade (Grade 5 is Ti-6Al-4V) and condition: annealed, STA (solution treated and aged), or ELI (extra low interstitials for medical)",
-            "Material certs and full batch traceability are almost always required (AMS 4928, AMS 4911)",
-            "Ask about post-machining: chemical milling, shot peening, anodize, or PVD coatings are common in aerospace",
-            "Budget for significantly longer lead times and higher per-part cost — plan for 4–8× the cost of equivalent 6061 parts",
-        ],
-    },
-    "Inconel — 718": {
-        "difficulty": "Very High",
-        "machining_reality": (
-            "Inconel 718 is among the most punishing CNC materials."
-            " It work-hardens like stainless but worse, has even lower"
-            " thermal conductivity than titanium, and is highly abrasive"
-            " due to hard carbide particles in the microstructure. Cutting"
-            " temperatures routinely exceed 700 °C. Ceramic inserts can"
-            " rough at higher speeds (SFM 600–1000) but are brittle and"
-            " demand rigid, chatter-free setups. Carbide finishing at SFM"
-            " 70–120 is common. Tool life in Inconel is often measured in"
-            " minutes, not parts — a single roughing insert may last"
-            " 5–15 minutes of cut time."
-        ),
-        "cost_drivers": [
-            "Extreme tool wear: roughing inserts may last only 5–15 minutes of cutting time; ceramics needed for productivity",
-            "Very slow cycle times with carbide (SFM 70–120); ceramics are faster but require perfect rigidity and zero chatter",
-            "High-pressure coolant (1000+ PSI through spindle) is mandatory — inadequate coolant destroys tools in seconds",
-            "Cutting forces are very high; specialized high-clamp-force workholding and rigid, high-torque spindles are required",
-            "Stock cost is extreme ($30–80/lb); scrap is catastrophically expensive on large forgings or billets",
-        ],
-        "quote_implications": [
-            "Confirm alloy condition: solution annealed (~30 HRC), age-hardened (~40–44 HRC), or direct-aged — machining difficulty varies enormously",
-            "Material certs with full heat-lot traceability are mandatory (AMS 5662, AMS 5663)",
-            "Verify the shop has Inconel experience, ceramic tooling, and high-pressure coolant capability before committing",
-            "Expect cost and lead time 6–10× equivalent steel parts; fewer shops are qualified and capacity is limited",
-        ],
-    },
-    "Other / Unknown": {
-        "difficulty": "Unknown",
-        "machining_reality": (
-            "Material is not specified. Without knowing the alloy, hardness,"
-            " and thermal properties, it is impossible to estimate tool wear"
-            " rates, cycle times, or coolant requirements. A quote without"
-            " a confirmed material is a guess — the difference between"
-            " machining 6061 aluminum and Inconel 718 is easily a 10×"
-            " cost multiplier on the same geometry."
-        ),
-        "cost_drivers": [
-            "Tool wear is unpredictable: a 10× range between easy aluminum and superalloys",
-            "Cycle time cannot be estimated — feeds, speeds, and depth of cut depend entirely on material",
-            "Coolant strategy (mist, flood, high-pressure TSC) depends on material thermal properties",
-            "Workholding forces and rigidity requirements scale with material hardness and cutting forces",
-            "Scrap risk is unquantifiable: material cost per pound ranges from $2 (aluminum) to $80 (Inconel)",
-        ],
-        "quote_implications": [
-            "Request exact material specification (alloy, grade, temper/condition) before quoting",
-            "Confirm hardness or heat treat state — this matters more than alloy name alone for machinability",
-            "Ask about any coatings, plating, or special post-machining processes",
-            "Without material, any quoted price is a placeholder — flag this to the customer explicitly",
-        ],
-    },
-}
+)
 
 
 def render_material_section(material: str) -> None:
     """Display the material machining reality callout."""
-    mat_info = MATERIAL_KB.get(material)
-    if mat_info is None:
+    rendered = MATERIAL_RENDERED.get(material)
+    if rendered is None:
         return
 
     st.markdown("---")
     st.subheader("Material machining reality")
 
-    st.markdown(f"**Difficulty:** {mat_info['difficulty']}")
-    st.write(mat_info["machining_reality"])
-
-    col1, col2 = st.columns(2)
+    st.markdown(rendered["reality_md"])
 
-    with col1:
-        st.markdown("**Cost drivers**")
-        for item in mat_info["cost_drivers"]:
-            st.markdown(f"- {item}")
-
-    with col2:
-        st.markdown("**Quote implications**")
-        for item in mat_info["quote_implications"]:
-            st.markdown(f"- {item}")
+    st.markdown(rendered["columns_html"], unsafe_allow_html=True)
 
 
 def _material_triage_label(material: str) -> str:
     """Return a clean material label for triage text (strip parenthetical notes)."""
-    if " (" in material:
-        return material.split(" (")[0].strip()
-    return material
+    return material.partition(" (")[0].rstrip()
 
 
 def compute_contextual_risk(risk_score: int) -> str:
@@ -637,44 +816,318 @@ def compute_contextual_risk(risk_score: int) -> str:
 
 
 MESH_EXTENSIONS = {".stl", ".obj"}
-COMPONENT_SPLIT_MAX_TRIANGLES = 1_000_000
+# Past this, binary STL gets triangle count and bbox only (no weld or topology).
+MESH_FULL_ANALYSIS_MAX_TRIANGLES = 10_000_000
+
+# Parsed uploads kept per process; a handful covers switching between recent files.
+PARSE_CACHE_MAX_ENTRIES = 8
+
+
+def _hash_file_bytes(data: bytes) -> bytes:
+    """Cache key for uploaded file bytes (one BLAKE2b pass over the buffer)."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+_PARSE_CACHE = st.cache_data(
+    show_spinner=False,
+    max_entries=PARSE_CACHE_MAX_ENTRIES,
+    hash_funcs={bytes: _hash_file_bytes},
+)
+
+
+# Binary STL: 80-byte header, uint32 triangle count, then 50-byte records.
+_STL_HEADER_BYTES = 84
+_STL_RECORD_BYTES = 50
+
+
+def _binary_stl_records(file_bytes: bytes):
+    """View binary STL bytes as a structured triangle array, or None if not binary STL."""
+    import numpy as np
+
+    if len(file_bytes) < _STL_HEADER_BYTES:
+        return None
+    tri_count = int.from_bytes(file_bytes[80:84], "little")
+    if len(file_bytes) != _STL_HEADER_BYTES + _STL_RECORD_BYTES * tri_count:
+        return None
+
+    return np.frombuffer(
+        file_bytes,
+        dtype=np.dtype(
+            [("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attr", "<u2")]
+        ),
+        count=tri_count,
+        offset=_STL_HEADER_BYTES,
+    )
+
+
+def _load_binary_stl(trimesh, records):
+    """Build a welded Trimesh straight from binary STL records.
+
+    trimesh.load(force="mesh") routes through a Scene and copies the mesh;
+    reading the records with one np.frombuffer skips that round trip. The
+    three private vertices per triangle are welded on exact float32 bit
+    patterns, which is cheaper than merge_vertices' rounding pass.
+    """
+    import numpy as np
+
+    # Adding 0 folds -0.0 into 0.0 so both weld to the same vertex.
+    corners = records["vertices"].reshape(-1, 3) + np.float32(0)
+    if not len(corners):
+        return trimesh.Trimesh(process=False)
+
+    # Sort corners by their (x, y, z) bit patterns and number each run of
+    # identical rows; that number is the welded vertex index.
+    bits = corners.view(np.uint32)
+    xy = (bits[:, 0].astype(np.uint64) << np.uint64(32)) | bits[:, 1]
+    order = np.lexsort((bits[:, 2], xy))
+    xy_sorted = xy[order]
+    z_sorted = bits[order, 2]
+    is_new = np.empty(len(order), dtype=bool)
+    is_new[0] = True
+    is_new[1:] = (xy_sorted[1:] != xy_sorted[:-1]) | (z_sorted[1:] != z_sorted[:-1])
+    faces = np.empty(len(order), dtype=np.int64)
+    faces[order] = np.cumsum(is_new) - 1
+
+    vertices = corners[order[is_new]].astype(np.float64)
+    return trimesh.Trimesh(vertices=vertices, faces=faces.reshape(-1, 3), process=False)
+
+
+def _edge_topology(faces, vertex_count: int):
+    """Return (is_watertight, face_adjacency) from one sort of the mesh edges.
+
+    Matches trimesh's is_watertight (every edge shared by exactly two faces)
+    and face_adjacency (face pairs across those edges) while sorting the
+    edge list once instead of once per property.
+    """
+    import numpy as np
+
+    edges = np.asarray(faces, dtype=np.int64)[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    edges.sort(axis=1)
+    keys = edges[:, 0] * vertex_count + edges[:, 1]
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+
+    run_starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    run_lengths = np.diff(np.r_[run_starts, len(keys)])
+    is_watertight = bool(len(keys)) and bool((run_lengths == 2).all())
+
+    # Edge row i belongs to face i // 3; degenerate faces can pair with
+    # themselves, which trimesh drops.
+    pair_starts = run_starts[run_lengths == 2]
+    face_adjacency = np.column_stack((order[pair_starts], order[pair_starts + 1])) // 3
+    face_adjacency = face_adjacency[face_adjacency[:, 0] != face_adjacency[:, 1]]
+    return is_watertight, face_adjacency
+
+
+def _component_labels(edges, node_count: int):
+    """Label nodes 0..node_count-1 by connected component of the edge graph.
+
+    Each node gets the lowest node index in its component, so the component
+    count is the number of nodes labelled with themselves. This is a numpy
+    union-find (hook every edge's higher root onto the lower one, then
+    pointer-jump to the roots) because trimesh's labelling needs scipy,
+    which is not a dependency.
+    """
+    import numpy as np
+
+    labels = np.arange(node_count)
+    while True:
+        first, second = labels[edges[:, 0]], labels[edges[:, 1]]
+        lower = np.minimum(first, second)
+        hooked = labels.copy()
+        np.minimum.at(hooked, first, lower)
+        np.minimum.at(hooked, second, lower)
+        while True:
+            jumped = hooked[hooked]
+            if np.array_equal(jumped, hooked):
+                break
+            hooked = jumped
+        if np.array_equal(hooked, labels):
+            return labels
+        labels = hooked
+
+
+# Exporters that write each facet's corners independently can jitter a shared
+# vertex by a few float32 ULPs; when the exact weld leaves open edges, corners
+# within this fraction of the bbox diagonal of each other (per axis) are welded.
+WELD_RELATIVE_TOLERANCE = 1e-6
+
+
+def _cell_leaders(cells):
+    """Return, for each integer (x, y, z) row of *cells*, the first row in its cell."""
+    import numpy as np
+
+    cells = cells - cells.min(axis=0)
+    try:
+        keys = np.ravel_multi_index(cells.T, cells.max(axis=0) + 1)
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    except ValueError:
+        # Too wide for one int64 key, e.g. far-off unreferenced vertices.
+        _, first, inverse = np.unique(
+            cells, axis=0, return_index=True, return_inverse=True
+        )
+    return first[inverse.ravel()]
+
+
+def _snap_faces(mesh, tolerance: float):
+    """Return faces re-indexed so vertices within *tolerance* share an index.
+
+    Vertices are binned on grids two tolerances wide, each axis either
+    aligned or offset by half a cell, so a pair closer than the tolerance on
+    every axis shares a cell in at least one of the eight grids even where
+    it straddles a boundary in the others. Returns None when no two vertices
+    share a cell, so the caller can keep the exact-weld topology.
+    """
+    import itertools
+
+    import numpy as np
+
+    scaled = mesh.vertices.view(np.ndarray) / (2.0 * tolerance)
+    index = np.arange(len(scaled))
+    edges = []
+    for offset in itertools.product((0.0, 0.5), repeat=3):
+        leaders = _cell_leaders(np.floor(scaled + offset).astype(np.int64))
+        joined = leaders != index
+        edges.append(np.column_stack((index[joined], leaders[joined])))
+    edges = np.concatenate(edges)
+    if not len(edges):
+        return None
+    return _component_labels(edges, len(scaled))[mesh.faces]
+
 
+def _referenced_bounds(mesh):
+    """Return (min_xyz, max_xyz) over the vertices faces use, or None if none.
 
+    Same result as mesh.bounds, which also ignores unreferenced vertices, but
+    without trimesh's cache hashing and with no masked copy when every vertex
+    is referenced, as after a weld.
+    """
+    import numpy as np
+
+    vertices = mesh.vertices.view(np.ndarray)
+    referenced = np.zeros(len(vertices), dtype=bool)
+    referenced[mesh.faces.view(np.ndarray)] = True
+    if not referenced.all():
+        vertices = vertices[referenced]
+    if not len(vertices):
+        return None
+    return vertices.min(axis=0), vertices.max(axis=0)
+
+
+def _oversized_stl_metrics(records) -> dict | str:
+    """Triangle count and bbox only, read straight from the binary STL records.
+
+    Welding and edge topology need several arrays the size of the mesh, so
+    meshes past MESH_FULL_ANALYSIS_MAX_TRIANGLES report watertightness and
+    components as not checked (None).
+    """
+    import numpy as np
+
+    triangles = records["vertices"]
+    finite = np.isfinite(triangles).all(axis=(1, 2))
+    if not finite.all():
+        triangles = triangles[finite]
+    if not len(triangles):
+        return "Mesh contains no geometry (0 vertices)."
+
+    corners = triangles.reshape(-1, 3)
+    bb_min = corners.min(axis=0).astype(np.float64)
+    bb_max = corners.max(axis=0).astype(np.float64)
+    bbox_dims, bbox_min, bbox_max = np.round(
+        (bb_max - bb_min, bb_min, bb_max), 4
+    ).tolist()
+    return {
+        "triangle_count": len(triangles),
+        "bbox_dims": bbox_dims,
+        "bbox_min": bbox_min,
+        "bbox_max": bbox_max,
+        "is_watertight": None,
+        "component_count": None,
+    }
+
+
+@_PARSE_CACHE
 def parse_mesh_metrics(file_bytes: bytes, file_type: str) -> dict | str:
     """Load a mesh from raw bytes and return basic geometric metrics.
 
     Returns a dict of metrics on success, or an error-message string on failure.
+    Results are cached on the file bytes so widget reruns skip the reparse.
     """
+    import numpy as np
+
     try:
-        mesh = trimesh.load(
-            io.BytesIO(file_bytes),
-            file_type=file_type.lstrip("."),
-        )
-        if isinstance(mesh, trimesh.Scene):
-            mesh = mesh.dump(concatenate=True)
+        records = _binary_stl_records(file_bytes) if file_type == ".stl" else None
+        if records is not None and len(records) > MESH_FULL_ANALYSIS_MAX_TRIANGLES:
+            return _oversized_stl_metrics(records)
+
+        trimesh = _get_trimesh()
+        mesh = None
+        if records is not None:
+            mesh = _load_binary_stl(trimesh, records)
+        welded = mesh is not None
+        if mesh is None:
+            # process=False skips trimesh's load-time cleanup and skip_materials
+            # avoids resolving OBJ material libraries we never display;
+            # merge_tex/merge_norm key OBJ vertices on position alone rather
+            # than splitting them per UV/normal index, since only geometry is
+            # measured; force="mesh" concatenates multi-body files into one
+            # Trimesh.
+            mesh = trimesh.load(
+                io.BytesIO(file_bytes),
+                file_type=file_type.lstrip("."),
+                process=False,
+                skip_materials=True,
+                merge_tex=True,
+                merge_norm=True,
+                force="mesh",
+            )
         if not isinstance(mesh, trimesh.Trimesh):
             return f"Unexpected mesh type after loading: {type(mesh).__name__}"
 
-        if mesh.bounds is None or len(mesh.vertices) == 0:
+        mesh.remove_infinite_values()
+        bounds = _referenced_bounds(mesh)
+        if bounds is None:
             return "Mesh contains no geometry (0 vertices)."
 
-        bb_min = mesh.bounds[0]
-        bb_max = mesh.bounds[1]
+        # Bounds stay float64: a float32 copy would cost an extra vertex
+        # pass and lose the fourth decimal on coordinates past ~1000.
+        bb_min, bb_max = bounds
         dims = bb_max - bb_min
 
-        tri_count = int(len(mesh.faces))
+        tri_count = mesh.faces.shape[0]
 
-        if tri_count <= COMPONENT_SPLIT_MAX_TRIANGLES:
-            body_count: int | None = len(mesh.split(only_watertight=False))
-        else:
-            body_count = None
+        # STL stores three private vertices per triangle; weld them so the
+        # watertight and component checks see shared edges. UV and normal
+        # seams must not keep coincident OBJ vertices apart either.
+        if not welded:
+            mesh.merge_vertices(merge_tex=True, merge_norm=True)
+
+        is_watertight, face_adjacency = _edge_topology(
+            mesh.faces, mesh.vertices.shape[0]
+        )
+        if not is_watertight:
+            # Only meshes with open edges pay for the tolerance search.
+            tolerance = float(np.linalg.norm(dims)) * WELD_RELATIVE_TOLERANCE
+            snapped = _snap_faces(mesh, tolerance) if tolerance > 0 else None
+            if snapped is not None:
+                is_watertight, face_adjacency = _edge_topology(
+                    snapped, mesh.vertices.shape[0]
+                )
+
+        # Same face-adjacency components mesh.split() finds, counted from
+        # one label per face instead of an index array per component.
+        labels = _component_labels(face_adjacency, tri_count)
+        body_count = int(np.count_nonzero(labels == np.arange(tri_count)))
+
+        # One rounding pass over all three vectors; tolist() yields plain floats.
+        bbox_dims, bbox_min, bbox_max = np.round((dims, bb_min, bb_max), 4).tolist()
 
         return {
             "triangle_count": tri_count,
-            "bbox_dims": np.round(dims, 4).tolist(),
-            "bbox_min": np.round(bb_min, 4).tolist(),
-            "bbox_max": np.round(bb_max, 4).tolist(),
-            "is_watertight": bool(mesh.is_watertight),
+            "bbox_dims": bbox_dims,
+            "bbox_min": bbox_min,
+            "bbox_max": bbox_max,
+            "is_watertight": is_watertight,
             "component_count": body_count,
         }
     except Exception as exc:
@@ -686,35 +1139,32 @@ def render_mesh_metrics(metrics: dict) -> None:
     st.markdown("---")
     st.subheader("Extracted metrics")
 
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**Triangle count**")
-        st.write(f"{metrics['triangle_count']:,}")
-
-        st.markdown("**Bounding box dimensions (X, Y, Z)**")
-        dx, dy, dz = metrics["bbox_dims"]
-        st.write(f"{dx}  ×  {dy}  ×  {dz}")
-
-    with col2:
-        st.markdown("**Watertight**")
-        st.write("Yes" if metrics["is_watertight"] else "No")
-
-        st.markdown("**Disconnected components**")
-        if metrics["component_count"] is not None:
-            st.write(str(metrics["component_count"]))
-        else:
-            st.write("(skipped for performance)")
-
-        st.markdown("**Bounding box min**")
-        st.write(
-            f"({metrics['bbox_min'][0]}, {metrics['bbox_min'][1]}, {metrics['bbox_min'][2]})"
-        )
+    dx, dy, dz = metrics["bbox_dims"]
+    left = _html_field("Triangle count", f"{metrics['triangle_count']:,}")
+    left += _html_field("Bounding box dimensions (X, Y, Z)", f"{dx}  ×  {dy}  ×  {dz}")
+
+    watertight = metrics["is_watertight"]
+    components = metrics["component_count"]
+    right = _html_field(
+        "Watertight",
+        (
+            "(skipped for performance)"
+            if watertight is None
+            else "Yes" if watertight else "No"
+        ),
+    )
+    right += _html_field(
+        "Disconnected components",
+        "(skipped for performance)" if components is None else str(components),
+    )
+    right += _html_field(
+        "Bounding box min", "({}, {}, {})".format(*metrics["bbox_min"])
+    )
+    right += _html_field(
+        "Bounding box max", "({}, {}, {})".format(*metrics["bbox_max"])
+    )
 
-        st.markdown("**Bounding box max**")
-        st.write(
-            f"({metrics['bbox_max'][0]}, {metrics['bbox_max'][1]}, {metrics['bbox_max'][2]})"
-        )
+    st.markdown(_html_columns(left, right), unsafe_allow_html=True)
 
     st.caption(
         "Mesh formats may not reliably encode units (mm vs in). "
@@ -722,7 +1172,7 @@ def render_mesh_metrics(metrics: dict) -> None:
     )
 
 
-DXF_TRACKED_TYPES = [
+DXF_TRACKED_TYPES = (
     "LINE",
     "ARC",
     "CIRCLE",
@@ -731,54 +1181,163 @@ DXF_TRACKED_TYPES = [
     "SPLINE",
     "TEXT",
     "MTEXT",
-]
+)
+
+
+# Entity types whose exact bounding box follows from their defining points.
+DXF_FAST_BBOX_TYPES = frozenset({"LINE", "POINT", "CIRCLE", "ARC", "LWPOLYLINE"})
+
+# Above this many modelspace entities, drawings the primitive path can't
+# bound settle for the header's saved extents (or ezdxf's fast, control-point
+# bbox) instead of an exact walk.
+DXF_APPROX_EXTENTS_MIN_ENTITIES = 50_000
+
+# DXF writers store ±1e20 in $EXTMIN/$EXTMAX when the extents were never set.
+_DXF_UNSET_EXTENT = 1e20
+
+
+def _header_extents(doc) -> tuple | None:
+    """Return ($EXTMIN, $EXTMAX) from the DXF header, or None if unset or invalid.
+
+    A zero-size box is treated as unset: writers that never refresh the
+    header leave it at the origin.
+    """
+    ext_min = doc.header.get("$EXTMIN")
+    ext_max = doc.header.get("$EXTMAX")
+    if ext_min is None or ext_max is None:
+        return None
+    for lo, hi in zip(ext_min, ext_max, strict=True):
+        if abs(lo) >= _DXF_UNSET_EXTENT or abs(hi) >= _DXF_UNSET_EXTENT or lo > hi:
+            return None
+    if tuple(ext_min) == tuple(ext_max):
+        return None
+    return ext_min, ext_max
+
+
+def _primitive_extents(entities) -> tuple[list[float], list[float]] | None:
+    """Return (min_xyz, max_xyz) for a modelspace made only of simple primitives.
+
+    Points are gathered in one pass and reduced with numpy instead of going
+    through ezdxf's generic per-entity bbox machinery. Returns None when the
+    modelspace is empty or holds anything else (curves, text, inserts,
+    bulged or OCS-rotated entities) so the caller can fall back to ezdxf.
+    """
+    import numpy as np
+
+    points: list[tuple[float, float, float]] = []
+    for entity in entities:
+        dtype = entity.dxftype()
+        if dtype not in DXF_FAST_BBOX_TYPES:
+            return None
+        if dtype == "LINE":
+            points.append(tuple(entity.dxf.start))
+            points.append(tuple(entity.dxf.end))
+        elif dtype == "POINT":
+            points.append(tuple(entity.dxf.location))
+        elif tuple(entity.dxf.extrusion) != (0.0, 0.0, 1.0):
+            return None
+        elif dtype == "CIRCLE":
+            cx, cy, cz = entity.dxf.center
+            r = entity.dxf.radius
+            points.append((cx - r, cy - r, cz))
+            points.append((cx + r, cy + r, cz))
+        elif dtype == "ARC":
+            # An arc's box spans its endpoints plus every axis crossing
+            # (0°, 90°, 180°, 270°) that falls inside its CCW sweep.
+            start = entity.dxf.start_angle % 360.0
+            span = (entity.dxf.end_angle - entity.dxf.start_angle) % 360.0
+            if span == 0.0:
+                return None
+            angles = [start, start + span]
+            angles.extend(
+                q for q in (0.0, 90.0, 180.0, 270.0) if (q - start) % 360.0 <= span
+            )
+            cx, cy, cz = entity.dxf.center
+            r = entity.dxf.radius
+            rad = np.radians(angles)
+            points.extend(
+                zip(cx + r * np.cos(rad), cy + r * np.sin(rad), [cz] * len(rad))
+            )
+        else:
+            xyb = np.asarray(entity.get_points("xyb"), dtype=np.float64)
+            if not len(xyb):
+                continue
+            if xyb[:, 2].any():
+                return None
+            # Reduce each polyline to its own corners so the final stack
+            # stays small no matter how many vertices the drawing holds.
+            z = entity.dxf.elevation
+            lo = xyb[:, :2].min(axis=0)
+            hi = xyb[:, :2].max(axis=0)
+            points.append((lo[0], lo[1], z))
+            points.append((hi[0], hi[1], z))
+
+    if not points:
+        return None
+    pts = np.array(points, dtype=np.float64)
+    return pts.min(axis=0).tolist(), pts.max(axis=0).tolist()
+
+
+def _dxf_text_stream(file_bytes: bytes, encoding: str) -> io.TextIOWrapper:
+    """Wrap DXF bytes as a lazily decoded text stream with universal newlines.
+
+    Universal newlines also let ezdxf read CRLF files written on Windows,
+    which came back empty when the decoded text went through io.StringIO.
+    """
+    return io.TextIOWrapper(io.BytesIO(file_bytes), encoding=encoding)
 
 
+@_PARSE_CACHE
 def parse_dxf_metrics(file_bytes: bytes) -> dict | str:
     """Parse a DXF from in-memory bytes and return entity metrics.
 
     Returns a dict of metrics on success, or an error-message string on failure.
+    Results are cached on the file bytes so widget reruns skip the reparse.
     """
+    import numpy as np
+
     try:
+        ezdxf, ezdxf_bbox = _get_ezdxf()
+        # Decode while ezdxf reads instead of materializing the whole file as
+        # a str; only non-UTF-8 files pay for a second pass as latin-1.
         try:
-            text = file_bytes.decode("utf-8")
+            doc = ezdxf.read(_dxf_text_stream(file_bytes, "utf-8"))
         except UnicodeDecodeError:
-            text = file_bytes.decode("latin-1")
-        doc = ezdxf.read(io.StringIO(text))
+            doc = ezdxf.read(_dxf_text_stream(file_bytes, "latin-1"))
         msp = doc.modelspace()
 
-        counts_by_type: dict[str, int] = {}
-        layers: set[str] = set()
-        total = 0
-
-        for entity in msp:
-            total += 1
-            dtype = entity.dxftype()
-            if dtype in DXF_TRACKED_TYPES:
-                counts_by_type[dtype] = counts_by_type.get(dtype, 0) + 1
-            layers.add(entity.dxf.layer)
+        entities = list(msp)
+        type_counts = Counter(entity.dxftype() for entity in entities)
+        layers = {entity.dxf.layer for entity in entities}
 
         extents: dict | None = None
-        cache = ezdxf_bbox.Cache()
-        bounding_box = ezdxf_bbox.extents(msp, cache=cache)
-        if bounding_box.has_data:
-            ext_min = bounding_box.extmin
-            ext_max = bounding_box.extmax
-            ext_size = ext_max - ext_min
-            extents = {
-                "min": [round(ext_min.x, 4), round(ext_min.y, 4), round(ext_min.z, 4)],
-                "max": [round(ext_max.x, 4), round(ext_max.y, 4), round(ext_max.z, 4)],
-                "size": [
-                    round(ext_size.x, 4),
-                    round(ext_size.y, 4),
-                    round(ext_size.z, 4),
-                ],
-            }
+        ext_min = ext_max = None
+        approximate = len(entities) > DXF_APPROX_EXTENTS_MIN_ENTITIES
+        # The header can be stale, so it only stands in for the generic
+        # ezdxf walk, never for the exact primitive path.
+        fast_extents = _primitive_extents(entities)
+        if fast_extents is None and approximate:
+            fast_extents = _header_extents(doc)
+        if fast_extents is not None:
+            ext_min, ext_max = (ezdxf.math.Vec3(p) for p in fast_extents)
+        else:
+            cache = ezdxf_bbox.Cache()
+            bounding_box = ezdxf_bbox.extents(msp, fast=approximate, cache=cache)
+            if bounding_box.has_data:
+                ext_min = bounding_box.extmin
+                ext_max = bounding_box.extmax
+        if ext_min is not None and ext_max is not None:
+            # Same single rounding pass as the mesh bbox.
+            corners = np.array((ext_min.xyz, ext_max.xyz), dtype=np.float64)
+            ext_lo, ext_hi, ext_size = np.round(
+                (corners[0], corners[1], corners[1] - corners[0]), 4
+            ).tolist()
+            extents = {"min": ext_lo, "max": ext_hi, "size": ext_size}
 
         return {
-            "total_entities": total,
+            "total_entities": len(entities),
             "counts_by_type": {
-                t: counts_by_type[t] for t in DXF_TRACKED_TYPES if t in counts_by_type
+                t: type_counts[t] for t in DXF_TRACKED_TYPES if t in type_counts
             },
             "layer_count": len(layers),
             "extents": extents,
@@ -792,51 +1351,31 @@ def render_dxf_metrics(metrics: dict) -> None:
     st.markdown("---")
     st.subheader("Extracted metrics")
 
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**Total entities**")
-        st.write(f"{metrics['total_entities']:,}")
-
-        st.markdown("**Layers referenced**")
-        st.write(str(metrics["layer_count"]))
-
-        extents = metrics.get("extents")
-        if extents:
-            sx, sy, sz = extents["size"]
-            has_z = sz != 0.0
-
-            if has_z:
-                st.markdown("**Approx extents (X × Y × Z)**")
-                st.write(f"{sx}  ×  {sy}  ×  {sz}")
-            else:
-                st.markdown("**Approx extents (X × Y)**")
-                st.write(f"{sx}  ×  {sy}")
-
-            st.markdown("**Extents min**")
-            if has_z:
-                st.write(
-                    f"({extents['min'][0]}, {extents['min'][1]}, {extents['min'][2]})"
-                )
-            else:
-                st.write(f"({extents['min'][0]}, {extents['min'][1]})")
-
-            st.markdown("**Extents max**")
-            if has_z:
-                st.write(
-                    f"({extents['max'][0]}, {extents['max'][1]}, {extents['max'][2]})"
-                )
-            else:
-                st.write(f"({extents['max'][0]}, {extents['max'][1]})")
+    left = _html_field("Total entities", f"{metrics['total_entities']:,}")
+    left += _html_field("Layers referenced", str(metrics["layer_count"]))
 
-    with col2:
-        st.markdown("**Entity counts by type**")
-        counts = metrics["counts_by_type"]
-        if counts:
-            for dtype, count in counts.items():
-                st.markdown(f"- {dtype}: {count:,}")
+    extents = metrics.get("extents")
+    if extents:
+        sx, sy, sz = extents["size"]
+        if sz != 0.0:
+            left += _html_field("Approx extents (X × Y × Z)", f"{sx}  ×  {sy}  ×  {sz}")
+            left += _html_field("Extents min", "({}, {}, {})".format(*extents["min"]))
+            left += _html_field("Extents max", "({}, {}, {})".format(*extents["max"]))
         else:
-            st.write("No tracked entity types found.")
+            left += _html_field("Approx extents (X × Y)", f"{sx}  ×  {sy}")
+            left += _html_field("Extents min", "({}, {})".format(*extents["min"][:2]))
+            left += _html_field("Extents max", "({}, {})".format(*extents["max"][:2]))
+
+    counts = metrics["counts_by_type"]
+    if counts:
+        right = _html_bullets(
+            "Entity counts by type",
+            (f"{dtype}: {count:,}" for dtype, count in counts.items()),
+        )
+    else:
+        right = _html_field("Entity counts by type", "No tracked entity types found.")
+
+    st.markdown(_html_columns(left, right), unsafe_allow_html=True)
 
     if counts.get("SPLINE", 0) > 0:
         st.warning(
@@ -845,10 +1384,8 @@ def render_dxf_metrics(metrics: dict) -> None:
 
 
 def get_format_info(extension: str) -> dict | None:
-    """Resolve extension (including aliases) to FORMAT_KB entry."""
-    ext = extension.lower()
-    canonical = EXTENSION_TO_FORMAT.get(ext, ext)
-    return FORMAT_KB.get(canonical)
+    """Resolve a lowercase extension (including aliases) to its FORMAT_KB entry."""
+    return _FORMAT_BY_EXT.get(extension)
 
 
 def _quoting_reality_paragraph(info: dict) -> str:
@@ -911,7 +1448,7 @@ def _next_ask_reference(gc: str) -> tuple[str, str]:
 
 
 def render_summary_card(
-    info: dict,
+    canonical_ext: str,
     *,
     filename: str | None = None,
     extension: str | None = None,
@@ -924,7 +1461,7 @@ def render_summary_card(
     shows them.  When *material* is provided it is appended to the caption.
     When *contextual_risk* is provided the adjusted-risk row is included.
     """
-    st.subheader(info["label"])
+    st.subheader(FORMAT_KB[canonical_ext]["label"])
     if filename and extension and material:
         st.caption(f"{filename}  ·  {extension}  ·  {material}")
     elif filename and extension:
@@ -932,179 +1469,154 @@ def render_summary_card(
     elif extension:
         st.caption(extension)
 
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**Geometry class**")
-        st.write(info["geometry_class"])
-
-        st.markdown("**Typical authoring tools**")
-        for item in info["typical_authoring_tools"]:
-            st.markdown(f"- {item}")
-
-        st.markdown("**Common use cases**")
-        for item in info["common_use_cases"]:
-            st.markdown(f"- {item}")
-
-        st.markdown("**Survives export**")
-        for item in info["survives"]:
-            st.markdown(f"- {item}")
-
-        st.markdown("**Lost / at risk**")
-        for item in info["lost"]:
-            st.markdown(f"- {item}")
-
-    with col2:
-        st.markdown("**DFM / quote confidence**")
-        st.write(info["dfm_quote_confidence"])
+    card = CARD_RENDERED[canonical_ext]
+    right_head, right_tail = card["right_html"]
+    if contextual_risk is not None:
+        right_head += _html_field("Quote risk (context-adjusted)", contextual_risk)
+    st.markdown(
+        _html_columns(card["left_html"], right_head + right_tail),
+        unsafe_allow_html=True,
+    )
 
-        st.markdown("**Quote risk baseline**")
-        st.write(info["quote_risk_baseline"])
 
-        if contextual_risk is not None:
-            st.markdown("**Quote risk (context-adjusted)**")
-            st.write(contextual_risk)
+# Canonical ext → (workflow chain, common failure note or None).
+WORKFLOW_FLOWS: dict[str, tuple[str, str | None]] = {
+    ".step": ("STEP → CAM → machining", None),
+    ".iges": (
+        "IGES → stitch/repair → solidify → CAM → machining",
+        "Common failure: surface gaps that prevent solid creation; healing may take multiple rounds.",
+    ),
+    ".stl": (
+        "STL → remodel or surface fit → CAM → machining",
+        "Common failure: ambiguous units (mm vs in) and faceted surfaces too coarse for precision toolpaths.",
+    ),
+    ".obj": (
+        "OBJ → remodel or surface fit → CAM → machining",
+        "Common failure: no engineering units; visualization-quality mesh rarely meets CNC tolerance needs.",
+    ),
+    ".sldprt": (
+        "SLDPRT → export to STEP → CAM → machining",
+        "Common failure: recipient lacks SolidWorks; file cannot be opened or re-exported.",
+    ),
+    ".sldasm": (
+        "SLDASM → export to STEP (per-part) → CAM → machining",
+        "Common failure: missing referenced parts or broken assembly mates after export.",
+    ),
+    ".prt": (
+        "PRT → export to STEP → CAM → machining",
+        "Common failure: wrong CAD system (NX vs Creo); file may not open at all.",
+    ),
+    ".catpart": (
+        "CATPART → export to STEP → CAM → machining",
+        "Common failure: no CATIA license; part is inaccessible without it.",
+    ),
+    ".dwg": (
+        "DWG → extract 2D profiles → verify dims/tolerances → 2.5D CAM → machining",
+        "Common failure: 3D data mixed with 2D layouts; unclear which entities define the part.",
+    ),
+    ".dxf": (
+        "DXF → verify units + thickness + tolerances → 2.5D CAM/profile → machining",
+        "Common failure: splines that CAM cannot process; entity cleanup required.",
+    ),
+}
 
-        st.markdown("**Automation friendliness**")
-        st.write(info["automation_friendliness"])
 
-        st.markdown("**Notes**")
-        for item in info["notes"]:
-            st.markdown(f"- {item}")
+@st.cache_resource
+def _field_guide_text(canonical_ext: str) -> dict[str, str | None]:
+    """Resolve every KB-derived string the field guide shows for *canonical_ext*."""
+    info = FORMAT_KB[canonical_ext]
+    gc = info["geometry_class"]
+    risk_base, conf_base = SCORE_BASELINES.get(gc, DEFAULT_SCORE_BASELINE)
+    flow = WORKFLOW_FLOWS.get(canonical_ext)
+    if canonical_ext in MESH_EXTENSIONS:
+        adjust_caption = (
+            "Metric-based adjustments that can apply when a mesh file is analyzed:"
+        )
+        adjust_md = _md_bullets(
+            (
+                "**Non-watertight mesh:** risk +10, confidence −10 — gaps or holes in the surface.",
+                "**Multiple disconnected components:** risk +8 — more than one body in the file.",
+                "**High triangle count (>500k):** risk +5 — heavy meshes are harder to process and may indicate poor export.",
+                "**Very high triangle count (>2M):** risk +10 — binary STL past 10M triangles skips the watertight and component checks for performance.",
+            )
+        )
+    elif canonical_ext == ".dxf":
+        adjust_caption = (
+            "Metric-based adjustments that can apply when a DXF is analyzed:"
+        )
+        adjust_md = _md_bullets(
+            (
+                "**Splines present:** risk +10, confidence −5 — may need conversion to arcs/polylines for CAM.",
+                "**Very large extents (max dimension >10,000):** risk +5 — verify units (e.g. mm vs tenths).",
+                "**Very small extents (0 < max dimension < 1):** risk +5 — verify units (e.g. in vs mm).",
+            )
+        )
+    else:
+        adjust_caption = "No file-level metrics are extracted for this format; scoring uses the baseline only."
+        adjust_md = None
+    next_ask, unknown_line = _next_ask_reference(gc)
+    return {
+        "what": FORMAT_WHAT_THIS_IS.get(canonical_ext, ""),
+        "quoting": _quoting_reality_paragraph(info),
+        "flow_md": f"**{flow[0]}**" if flow else None,
+        "flow_caption": flow[1] if flow else None,
+        "baseline_md": f"**Baseline (this geometry class):** risk {risk_base}, confidence {conf_base}.",
+        "adjust_caption": adjust_caption,
+        "adjust_md": adjust_md,
+        "next_ask": next_ask,
+        "unknown_line": unknown_line,
+    }
 
 
-def render_format_field_guide(info: dict, canonical_ext: str) -> None:
+def render_format_field_guide(canonical_ext: str) -> None:
     """Render the Learn — Formats field guide: What this file is, Where it comes from, Keep vs lose, Quoting reality, Scoring, What to ask next."""
-    gc = info["geometry_class"]
-    bullet_notes = FORMAT_BULLET_NOTES.get(canonical_ext, {})
+    text = _field_guide_text(canonical_ext)
 
     # What this file is
-    what = FORMAT_WHAT_THIS_IS.get(canonical_ext, "")
-    if what:
+    if text["what"]:
         st.subheader("What this file is")
-        st.write(what)
+        st.write(text["what"])
 
     # Where it comes from
     st.subheader("Where it comes from")
     st.caption("Typical authoring tools and common use cases.")
+    learn_md = LEARN_MD[canonical_ext]
     col_where1, col_where2 = st.columns(2)
     with col_where1:
-        st.markdown("**Typical authoring tools**")
-        for item in info["typical_authoring_tools"]:
-            st.markdown(f"- {item}")
+        st.markdown(learn_md["tools"])
     with col_where2:
-        st.markdown("**Common use cases**")
-        for item in info["common_use_cases"]:
-            st.markdown(f"- {item}")
+        st.markdown(learn_md["uses"])
 
     # What you keep vs what you lose
     st.subheader("What you keep vs what you lose")
     col_keep, col_lose = st.columns(2)
     with col_keep:
-        st.markdown("**Survives**")
-        for item in info["survives"]:
-            note = bullet_notes.get("survives", {}).get(item)
-            st.markdown(f"- {item}" + (f" ({note})" if note else ""))
+        st.markdown(learn_md["survives"])
     with col_lose:
-        st.markdown("**Lost or at risk**")
-        for item in info["lost"]:
-            note = bullet_notes.get("lost", {}).get(item)
-            st.markdown(f"- {item}" + (f" ({note})" if note else ""))
+        st.markdown(learn_md["lost"])
 
     # Quoting reality
     st.subheader("Quoting reality")
-    st.write(_quoting_reality_paragraph(info))
+    st.write(text["quoting"])
 
     # Typical manufacturing workflow
-    _WORKFLOW_FLOWS: dict[str, tuple[str, str | None]] = {
-        ".step": ("STEP → CAM → machining", None),
-        ".iges": (
-            "IGES → stitch/repair → solidify → CAM → machining",
-            "Common failure: surface gaps that prevent solid creation; healing may take multiple rounds.",
-        ),
-        ".stl": (
-            "STL → remodel or surface fit → CAM → machining",
-            "Common failure: ambiguous units (mm vs in) and faceted surfaces too coarse for precision toolpaths.",
-        ),
-        ".obj": (
-            "OBJ → remodel or surface fit → CAM → machining",
-            "Common failure: no engineering units; visualization-quality mesh rarely meets CNC tolerance needs.",
-        ),
-        ".sldprt": (
-            "SLDPRT → export to STEP → CAM → machining",
-            "Common failure: recipient lacks SolidWorks; file cannot be opened or re-exported.",
-        ),
-        ".sldasm": (
-            "SLDASM → export to STEP (per-part) → CAM → machining",
-            "Common failure: missing referenced parts or broken assembly mates after export.",
-        ),
-        ".prt": (
-            "PRT → export to STEP → CAM → machining",
-            "Common failure: wrong CAD system (NX vs Creo); file may not open at all.",
-        ),
-        ".catpart": (
-            "CATPART → export to STEP → CAM → machining",
-            "Common failure: no CATIA license; part is inaccessible without it.",
-        ),
-        ".dwg": (
-            "DWG → extract 2D profiles → verify dims/tolerances → 2.5D CAM → machining",
-            "Common failure: 3D data mixed with 2D layouts; unclear which entities define the part.",
-        ),
-        ".dxf": (
-            "DXF → verify units + thickness + tolerances → 2.5D CAM/profile → machining",
-            "Common failure: splines that CAM cannot process; entity cleanup required.",
-        ),
-    }
-    _flow = _WORKFLOW_FLOWS.get(canonical_ext)
-    if _flow:
+    if text["flow_md"]:
         st.subheader("Typical manufacturing workflow")
-        st.markdown(f"**{_flow[0]}**")
-        if _flow[1]:
-            st.caption(_flow[1])
+        st.markdown(text["flow_md"])
+        if text["flow_caption"]:
+            st.caption(text["flow_caption"])
 
     # How scoring works here
     st.subheader("How scoring works here")
-    risk_base, conf_base = SCORE_BASELINES.get(gc, (50, 50))
-    st.markdown(
-        f"**Baseline (this geometry class):** risk {risk_base}, confidence {conf_base}."
-    )
-    if canonical_ext in MESH_EXTENSIONS:
-        st.caption(
-            "Metric-based adjustments that can apply when a mesh file is analyzed:"
-        )
-        st.markdown(
-            "- **Non-watertight mesh:** risk +10, confidence −10 — gaps or holes in the surface."
-        )
-        st.markdown(
-            "- **Multiple disconnected components:** risk +8 — more than one body in the file."
-        )
-        st.markdown(
-            "- **High triangle count (>500k):** risk +5 — heavy meshes are harder to process and may indicate poor export."
-        )
-        st.markdown(
-            "- **Very high triangle count (>2M):** risk +10 — component count is skipped for performance; risk still increases."
-        )
-    elif canonical_ext == ".dxf":
-        st.caption("Metric-based adjustments that can apply when a DXF is analyzed:")
-        st.markdown(
-            "- **Splines present:** risk +10, confidence −5 — may need conversion to arcs/polylines for CAM."
-        )
-        st.markdown(
-            "- **Very large extents (max dimension >10,000):** risk +5 — verify units (e.g. mm vs tenths)."
-        )
-        st.markdown(
-            "- **Very small extents (0 < max dimension < 1):** risk +5 — verify units (e.g. in vs mm)."
-        )
-    else:
-        st.caption(
-            "No file-level metrics are extracted for this format; scoring uses the baseline only."
-        )
+    st.markdown(text["baseline_md"])
+    st.caption(text["adjust_caption"])
+    if text["adjust_md"]:
+        st.markdown(text["adjust_md"])
 
     # What to ask next
     st.subheader("What to ask next")
-    next_ask, unknown_line = _next_ask_reference(gc)
-    st.write(next_ask)
-    st.caption(unknown_line)
+    st.write(text["next_ask"])
+    st.caption(text["unknown_line"])
 
 
 def build_triage_summary(
@@ -1136,7 +1648,7 @@ def build_triage_summary(
     issues: list[str] = []
 
     if mesh_metrics is not None:
-        if not mesh_metrics.get("is_watertight", True):
+        if mesh_metrics.get("is_watertight") is False:
             issues.append("mesh is not watertight")
         cc = mesh_metrics.get("component_count")
         if cc is not None and cc > 1:
@@ -1194,38 +1706,42 @@ def build_triage_summary(
 # ---------------------------------------------------------------------------
 
 # geometry_class → (risk_baseline, confidence_baseline) for CNC machining
-SCORE_BASELINES: dict[str, tuple[int, int]] = {
-    "B-Rep": (15, 85),
-    "Surface": (40, 55),
-    "Mesh": (75, 25),
-    "Parametric": (20, 80),
-    "2D Drawing": (45, 50),
-}
+SCORE_BASELINES: Mapping[str, tuple[int, int]] = MappingProxyType(
+    {
+        "B-Rep": (15, 85),
+        "Surface": (40, 55),
+        "Mesh": (75, 25),
+        "Parametric": (20, 80),
+        "2D Drawing": (45, 50),
+    }
+)
+# (risk, confidence) for a geometry class missing from SCORE_BASELINES.
+DEFAULT_SCORE_BASELINE = (50, 50)
 
-RISK_BANDS: list[tuple[int, str, str]] = [
+RISK_BANDS: tuple[tuple[int, str, str], ...] = (
     (20, "Low", "#2ecc71"),
     (40, "Moderate", "#f1c40f"),
     (60, "Elevated", "#e67e22"),
     (80, "High", "#e74c3c"),
     (100, "Severe", "#c0392b"),
-]
+)
 
-CONFIDENCE_BANDS: list[tuple[int, str, str]] = [
+CONFIDENCE_BANDS: tuple[tuple[int, str, str], ...] = (
     (20, "Very low", "#c0392b"),
     (40, "Low", "#e74c3c"),
     (60, "Medium", "#e67e22"),
     (80, "High", "#f1c40f"),
     (100, "Very high", "#2ecc71"),
-]
+)
 
 
 def score_to_band(score: int, kind: str) -> tuple[str, str]:
     """Return (descriptor, hex_color) for a 0–100 score."""
     bands = RISK_BANDS if kind == "risk" else CONFIDENCE_BANDS
-    for ceiling, label, color in bands:
-        if score <= ceiling:
-            return label, color
-    return bands[-1][1], bands[-1][2]
+    # First band whose ceiling is >= score; scores past the top land in the last.
+    i = bisect.bisect_left(bands, score, key=lambda band: band[0])
+    _, label, color = bands[min(i, len(bands) - 1)]
+    return label, color
 
 
 def compute_scores(
@@ -1235,13 +1751,14 @@ def compute_scores(
 ) -> tuple[int, int, list[str]]:
     """Return (risk_score, confidence_score, explanations)."""
     gc = info["geometry_class"]
-    risk, confidence = SCORE_BASELINES.get(gc, (50, 50))
+    risk, confidence = SCORE_BASELINES.get(gc, DEFAULT_SCORE_BASELINE)
     explanations: list[str] = [
         f"Baseline for {gc}: risk {risk}, confidence {confidence}"
     ]
 
     if mesh_metrics is not None:
-        if not mesh_metrics.get("is_watertight", True):
+        # None means the check was skipped for size, not that it failed.
+        if mesh_metrics.get("is_watertight", True) is False:
             risk += 10
             confidence -= 10
             explanations.append("Non-watertight mesh: risk +10, confidence −10")
@@ -1284,13 +1801,16 @@ def compute_scores(
     return risk, confidence, explanations
 
 
+_BAR_TEMPLATE = (
+    '<div style="background:#e0e0e0;border-radius:6px;height:18px;width:100%">'
+    '<div style="background:{color};width:{score}%;height:100%;border-radius:6px">'
+    "</div></div>"
+)
+
+
 def _colored_bar_html(score: int, color: str) -> str:
     """Return an HTML progress bar with the given color."""
-    return (
-        f'<div style="background:#e0e0e0;border-radius:6px;height:18px;width:100%">'
-        f'<div style="background:{color};width:{score}%;height:100%;border-radius:6px">'
-        f"</div></div>"
-    )
+    return _BAR_TEMPLATE.format(color=color, score=score)
 
 
 def render_scoring_section(
@@ -1317,20 +1837,21 @@ def render_scoring_section(
             _colored_bar_html(confidence_score, conf_color), unsafe_allow_html=True
         )
 
-    st.markdown("**Score drivers**")
-    for line in explanations:
-        st.markdown(f"- {line}")
+    st.markdown(f"**Score drivers**\n\n{_md_bullets(explanations)}")
 
 
 # Build the Learn-page dropdown options: canonical extensions + aliases.
-def _build_learn_options() -> list[str]:
-    options: list[str] = list(FORMAT_KB.keys())
+@st.cache_resource
+def _build_learn_options() -> dict[str, str]:
+    """Map each dropdown label to the raw extension it stands for."""
+    options: dict[str, str] = {ext: ext for ext in FORMAT_KB}
     for alias, canonical in sorted(EXTENSION_TO_FORMAT.items()):
-        options.append(f"{alias}  (→ {canonical})")
+        options[f"{alias}  (→ {canonical})"] = alias
     return options
 
 
-LEARN_OPTIONS = _build_learn_options()
+LEARN_OPTION_EXT = _build_learn_options()
+LEARN_OPTIONS = tuple(LEARN_OPTION_EXT)
 
 
 def _cnc_suitability_line(gc: str, conf: str) -> str:
@@ -1354,41 +1875,205 @@ def _cnc_suitability_line(gc: str, conf: str) -> str:
     return "Usable for 2D work — verify completeness"
 
 
-def _build_comparison_rows() -> list[dict]:
-    """Build comparison table rows for all canonical formats, sorted by baseline risk."""
-    rows: list[dict] = []
+@st.cache_resource
+def _comparison_table() -> list[dict[str, str]]:
+    """Comparison rows for all canonical formats, sorted by baseline risk and keyed by display column."""
+    keyed: list[tuple[int, dict[str, str]]] = []
     for ext, info in FORMAT_KB.items():
         gc = info["geometry_class"]
-        risk_base, conf_base = SCORE_BASELINES.get(gc, (50, 50))
+        risk_base, conf_base = SCORE_BASELINES.get(gc, DEFAULT_SCORE_BASELINE)
         risk_label, _ = score_to_band(risk_base, "risk")
         conf_label, _ = score_to_band(conf_base, "confidence")
-        rows.append(
-            {
-                "ext": ext,
-                "gc": gc,
-                "risk_base": risk_base,
-                "risk_label": risk_label,
-                "conf_base": conf_base,
-                "conf_label": conf_label,
-                "auto": info["automation_friendliness"],
-                "suitability": _cnc_suitability_line(gc, info["dfm_quote_confidence"]),
-            }
-        )
-    rows.sort(key=lambda r: r["risk_base"])
-    return rows
-
+        row = {
+            "Extension": ext,
+            "Geometry": gc,
+            "Risk": f"{risk_base} ({risk_label})",
+            "Confidence": f"{conf_base} ({conf_label})",
+            "Automation": info["automation_friendliness"],
+            "CNC suitability": _cnc_suitability_line(gc, info["dfm_quote_confidence"]),
+        }
+        keyed.append((risk_base, row))
+    keyed.sort(key=lambda pair: pair[0])
+    return [row for _, row in keyed]
+
+
+@st.cache_resource
+def _learn_materials_md() -> dict[str, str]:
+    """Join the Learn — Materials static sections into one markdown block each."""
+    # "How materials change cost and margin": paragraphs and subheadings.
+    cost_factors = (
+        (
+            "In CNC machining, **machine time is the dominant cost driver**. "
+            "Material choice directly controls how fast you can cut, how long "
+            "your tools last, and how much overhead goes into each part. "
+            "Understanding these dynamics is essential for accurate quoting."
+        ),
+        "#### Machine time",
+        (
+            "Harder and tougher materials require slower feeds and speeds, "
+            "directly increasing cycle time. A part that runs in 10 minutes "
+            "in 6061 aluminum may take 30–50 minutes in titanium or Inconel."
+        ),
+        "#### Tool wear and tool changes",
+        (
+            "Every material wears tooling differently. Aluminum is gentle on "
+            "cutters; stainless and nickel alloys destroy them. Tool changes "
+            "add cycle time and insert/endmill cost to every part."
+        ),
+        (
+            "- Aluminum: standard carbide endmills, long tool life\n"
+            "- Carbon steel: coated carbide, moderate life\n"
+            "- Stainless steel: premium coated carbide, frequent changes\n"
+            "- Titanium / Inconel: specialty inserts (ceramic, CBN), "
+            "aggressive replacement schedules"
+        ),
+        "#### Heat management and coolant",
+        (
+            "Cutting generates heat. Materials with low thermal conductivity "
+            "(titanium, Inconel) concentrate heat at the tool tip, "
+            "accelerating wear. Effective coolant delivery — especially "
+            "high-pressure through-spindle coolant — becomes mandatory for "
+            "these materials, adding machine capability requirements and cost."
+        ),
+        "#### Work hardening",
+        (
+            "Austenitic stainless steels (304, 316) and some nickel alloys "
+            "work-harden rapidly. If the tool rubs instead of cutting — due "
+            "to dull edges, light feeds, or poor rigidity — the surface "
+            "hardens and becomes even more difficult to machine. This creates "
+            "a vicious cycle of accelerating tool wear and degrading surface "
+            "finish."
+        ),
+        "#### Scrap risk and rework sensitivity",
+        (
+            "Expensive stock (titanium, Inconel, 7075) makes scrap costly. "
+            "Difficult-to-machine materials also leave less margin for rework "
+            "— a scrapped titanium billet can represent hundreds of dollars in "
+            "material alone, before any machine time is accounted for."
+        ),
+        "#### Inspection overhead",
+        (
+            "Tighter tolerances in harder materials mean more in-process "
+            "checks, CMM time, and potential first-article inspection (FAI) "
+            "requirements. Aerospace and medical materials (Ti-6Al-4V, "
+            "Inconel 718) almost always carry traceability and certification "
+            "requirements that add administrative cost."
+        ),
+    )
+    # Rule-of-thumb takeaways.
+    takeaways = (
+        "6061 aluminum is the safest default — it's forgiving, fast to cut, and cheap to quote.",
+        "7075 is stronger than 6061 but less tolerant of thin walls and residual stress.",
+        "Low-carbon steel (1018) is gummy — keep feeds aggressive to avoid work hardening and built-up edge.",
+        "4140 pre-hard (28–32 HRC) is manageable; above 40 HRC, expect a significant cost jump.",
+        "Stainless work-hardens — keep tools sharp, feeds engaged, and never let the cutter rub.",
+        "Titanium and Inconel punish tooling and reward conservative speeds with aggressive depth of cut.",
+        "Harder materials amplify every setup weakness: rigidity, workholding, and runout all matter more.",
+        "Through-spindle coolant is a nice-to-have for steel, but mandatory for titanium and Inconel.",
+        "Material cost matters twice: once for the stock, and again if you scrap it.",
+        "Always ask for material condition (temper, hardness, heat treat state) — it changes the quote more than alloy alone.",
+        "If the customer says 'stainless' without specifying a grade, assume 304 and ask — 17-4 PH and 316 are very different jobs.",
+        "When tolerances are tight on hard materials, plan for a finish pass and budget CMM time.",
+    )
+    # "What to ask customers": (heading, questions) per subsection.
+    ask_customers = (
+        (
+            "Material spec & condition",
+            (
+                "Exact alloy and grade (e.g., 6061-T6, 304L, Ti-6Al-4V)",
+                "Temper or hardness condition (annealed, pre-hard, aged)",
+                "Applicable material standard (AMS, ASTM, DIN, JIS)",
+                "Material certification or mill cert requirements",
+            ),
+        ),
+        (
+            "Stock form",
+            (
+                "Plate, bar, round, tube, forging, or billet",
+                "Near-net-shape or oversized stock",
+                "Customer-furnished material (CFM) or shop-procured",
+            ),
+        ),
+        (
+            "Quantity & lead time",
+            (
+                "Prototype vs production quantity",
+                "Required delivery date or lead time window",
+                "Blanket order or one-time run",
+                "Any material lead time concerns (long-lead alloys)",
+            ),
+        ),
+        (
+            "Critical tolerances / datums / GD&T",
+            (
+                "Tightest dimensional tolerance on the part",
+                "Key datums and datum reference frames",
+                "Any GD&T callouts (true position, profile, runout)",
+                "Whether tolerances are pre- or post-heat-treat",
+            ),
+        ),
+        (
+            "Surface finish, coatings, heat treat, special processes",
+            (
+                "Surface finish requirements (Ra / Rz callouts)",
+                "Coatings (anodize, plating, PVD, paint)",
+                "Heat treat (quench & temper, age hardening, stress relief)",
+                "Special processes (passivation, shot peening, NDT)",
+            ),
+        ),
+        (
+            "Inspection requirements",
+            (
+                "First Article Inspection (FAI) per AS9102 or equivalent",
+                "CMM dimensional report",
+                "Material certs and traceability",
+                "Any customer-specific quality clauses or QMS requirements",
+            ),
+        ),
+    )
+    return {
+        "cost_factors": "\n\n".join(cost_factors),
+        "takeaways": _md_bullets(takeaways),
+        "ask_customers": "\n\n".join(
+            f"#### {heading}\n\n{_md_bullets(questions)}"
+            for heading, questions in ask_customers
+        ),
+    }
 
-# ---------------------------------------------------------------------------
-# Sidebar navigation
-# ---------------------------------------------------------------------------
-st.sidebar.title("CAD File Profiler")
-page = st.sidebar.radio("Navigate", ["Analyze", "Learn — Formats", "Learn — Materials"])
 
 # ---------------------------------------------------------------------------
 # Analyze page
 # ---------------------------------------------------------------------------
-if page == "Analyze":
-    _scroll_to_top()
+# Extension → metrics parser taking (file_bytes, extension).
+_METRIC_PARSERS = {
+    **dict.fromkeys(MESH_EXTENSIONS, parse_mesh_metrics),
+    ".dxf": lambda file_bytes, _extension: parse_dxf_metrics(file_bytes),
+}
+
+
+def _parse_upload(uploaded_file, extension: str) -> dict | str | None:
+    """Return the parsed metrics for an upload, parsing it at most once per session.
+
+    Reruns for the same upload reuse the session's result instead of going
+    back through st.cache_data, which would re-hash the whole file to find
+    its cache entry. Returns None for formats without a metrics parser.
+    """
+    key = (uploaded_file.file_id, extension)
+    cached = st.session_state.get("_parsed_upload")
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    # UploadedFile is a BytesIO over the upload, and getvalue() hands back
+    # that same bytes object without copying (CPython BytesIO copy-on-write),
+    # so both parsers take the bytes directly.
+    parser = _METRIC_PARSERS.get(extension)
+    result = parser(uploaded_file.getvalue(), extension) if parser else None
+    st.session_state["_parsed_upload"] = (key, result)
+    return result
+
+
+def _page_analyze() -> None:
+    """Upload a CAD file and render its CNC intake assessment."""
     st.title("CNC Machining Intake")
     st.write(
         "Upload a CAD file to assess format quality and quote risk for CNC machining."
@@ -1398,82 +2083,85 @@ if page == "Analyze":
 
     uploaded_file = st.file_uploader("Upload CAD file")
 
-    if uploaded_file:
-        filename = uploaded_file.name
-        extension = os.path.splitext(filename)[1].lower()
-        info = get_format_info(extension)
-
-        if info:
-            # -- Compute everything before rendering -------------------------
-            mesh_metrics: dict | None = None
-            dxf_metrics: dict | None = None
-            mesh_error: str | None = None
-            dxf_error: str | None = None
-
-            if extension in MESH_EXTENSIONS:
-                file_bytes = uploaded_file.getvalue()
-                result = parse_mesh_metrics(file_bytes, extension)
-                if isinstance(result, dict):
-                    mesh_metrics = result
-                else:
-                    mesh_error = result
-            elif extension == ".dxf":
-                file_bytes = uploaded_file.getvalue()
-                result = parse_dxf_metrics(file_bytes)
-                if isinstance(result, dict):
-                    dxf_metrics = result
-                else:
-                    dxf_error = result
-
-            risk_score, confidence_score, explanations = compute_scores(
-                info, mesh_metrics, dxf_metrics
-            )
-            contextual_risk = compute_contextual_risk(risk_score)
-
-            # -- Render: summary card → scoring → triage → metrics ----------
-            render_summary_card(
-                info,
-                filename=filename,
-                extension=extension,
-                material=material,
-                contextual_risk=contextual_risk,
-            )
-
-            render_material_section(material)
+    if not uploaded_file:
+        return
 
-            render_scoring_section(risk_score, confidence_score, explanations)
+    filename = uploaded_file.name
+    # Same suffix os.path.splitext gives for a bare name: dot-files and
+    # names without a dot have no extension.
+    stem, dot, suffix = filename.rpartition(".")
+    extension = dot + suffix.lower() if stem.strip(".") else ""
+    info = get_format_info(extension)
 
-            triage_text = build_triage_summary(
-                info, contextual_risk, material, mesh_metrics, dxf_metrics
-            )
-            st.markdown("---")
-            st.markdown(f"**Triage summary:** {triage_text}")
-            st.text_area(
-                "Copy/paste triage summary",
-                value=triage_text,
-                height=80,
-                disabled=True,
-            )
+    if not info:
+        st.subheader("Unknown format")
+        st.caption(f"{filename}  ·  {extension}")
+        st.info("No format profile in knowledge base for this extension.")
+        return
 
-            if mesh_metrics is not None:
-                render_mesh_metrics(mesh_metrics)
-            elif mesh_error is not None:
-                st.warning(mesh_error)
+    # -- Compute everything before rendering ---------------------------
+    mesh_metrics: dict | None = None
+    dxf_metrics: dict | None = None
+    mesh_error: str | None = None
+    dxf_error: str | None = None
 
-            if dxf_metrics is not None:
-                render_dxf_metrics(dxf_metrics)
-            elif dxf_error is not None:
-                st.warning(dxf_error)
+    result = _parse_upload(uploaded_file, extension)
+    if extension in MESH_EXTENSIONS:
+        if isinstance(result, dict):
+            mesh_metrics = result
+        else:
+            mesh_error = result
+    elif extension == ".dxf":
+        if isinstance(result, dict):
+            dxf_metrics = result
         else:
-            st.subheader("Unknown format")
-            st.caption(f"{filename}  ·  {extension}")
-            st.info("No format profile in knowledge base for this extension.")
+            dxf_error = result
+
+    risk_score, confidence_score, explanations = compute_scores(
+        info, mesh_metrics, dxf_metrics
+    )
+    contextual_risk = compute_contextual_risk(risk_score)
+
+    # -- Render: summary card → scoring → triage → metrics -------------
+    render_summary_card(
+        CANONICAL_EXT[extension],
+        filename=filename,
+        extension=extension,
+        material=material,
+        contextual_risk=contextual_risk,
+    )
+
+    render_material_section(material)
+
+    render_scoring_section(risk_score, confidence_score, explanations)
+
+    triage_text = build_triage_summary(
+        info, contextual_risk, material, mesh_metrics, dxf_metrics
+    )
+    st.markdown(f"---\n\n**Triage summary:** {triage_text}")
+    st.text_area(
+        "Copy/paste triage summary",
+        value=triage_text,
+        height=80,
+        disabled=True,
+    )
+
+    if mesh_metrics is not None:
+        render_mesh_metrics(mesh_metrics)
+    elif mesh_error is not None:
+        st.warning(mesh_error)
+
+    if dxf_metrics is not None:
+        render_dxf_metrics(dxf_metrics)
+    elif dxf_error is not None:
+        st.warning(dxf_error)
+
 
 # ---------------------------------------------------------------------------
 # Learn — Formats page
 # ---------------------------------------------------------------------------
-elif page == "Learn — Formats":
-    _scroll_to_top()
+def _page_learn_formats() -> None:
+    """Format comparison table and per-format field guide."""
     st.title("Format knowledge base")
     st.write("Browse supported CAD format profiles for CNC machining intake.")
 
@@ -1483,44 +2171,30 @@ elif page == "Learn — Formats":
     st.subheader("Format comparison (CNC machining)")
     st.caption("All canonical formats, sorted from lowest to highest baseline risk.")
 
-    _comp_rows = _build_comparison_rows()
-
-    _header = (
-        "| Extension | Geometry | Risk | Confidence | Automation | CNC suitability |\n"
-        "|-----------|----------|------|------------|------------|----------------|\n"
-    )
-    _body = ""
-    for _r in _comp_rows:
-        _body += (
-            f"| `{_r['ext']}` "
-            f"| {_r['gc']} "
-            f"| {_r['risk_base']} ({_r['risk_label']}) "
-            f"| {_r['conf_base']} ({_r['conf_label']}) "
-            f"| {_r['auto']} "
-            f"| {_r['suitability']} |\n"
-        )
-    st.markdown(_header + _body)
+    st.dataframe(_comparison_table(), hide_index=True, width="stretch")
 
     st.markdown("---")
 
     selected = st.selectbox("Select an extension", LEARN_OPTIONS)
 
-    # Resolve alias labels like ".stp  (→ .step)" back to the raw extension and canonical key.
-    ext = selected.split("(")[0].strip() if "(" in selected else selected
-    ext_lower = ext.lower()
-    canonical_ext = EXTENSION_TO_FORMAT.get(ext_lower, ext_lower)
+    # Alias labels like ".stp  (→ .step)" map back to the raw extension.
+    ext = LEARN_OPTION_EXT[selected]
+    canonical_ext = CANONICAL_EXT.get(ext)
     info = get_format_info(ext)
 
     if info:
         st.subheader(info["label"])
         st.caption(f"{ext}  ·  {info['geometry_class']}")
-        render_format_field_guide(info, canonical_ext)
+        render_format_field_guide(canonical_ext)
+
 
 # ---------------------------------------------------------------------------
 # Learn — Materials page
 # ---------------------------------------------------------------------------
-elif page == "Learn — Materials":
-    _scroll_to_top()
+def _page_learn_materials() -> None:
+    """How material choice drives machining cost, plus quick reference."""
+    page_md = _learn_materials_md()
+
     st.title("CNC Machining Materials")
     st.write(
         "How material choice drives cost, cycle time, and quoting risk in "
@@ -1532,69 +2206,7 @@ elif page == "Learn — Materials":
     # ------------------------------------------------------------------
     st.header("How materials change cost and margin")
 
-    st.markdown(
-        "In CNC machining, **machine time is the dominant cost driver**. "
-        "Material choice directly controls how fast you can cut, how long "
-        "your tools last, and how much overhead goes into each part. "
-        "Understanding these dynamics is essential for accurate quoting."
-    )
-
-    st.markdown("#### Machine time")
-    st.markdown(
-        "Harder and tougher materials require slower feeds and speeds, "
-        "directly increasing cycle time. A part that runs in 10 minutes "
-        "in 6061 aluminum may take 30–50 minutes in titanium or Inconel."
-    )
-
-    st.markdown("#### Tool wear and tool changes")
-    st.markdown(
-        "Every material wears tooling differently. Aluminum is gentle on "
-        "cutters; stainless and nickel alloys destroy them. Tool changes "
-        "add cycle time and insert/endmill cost to every part."
-    )
-    st.markdown(
-        "- Aluminum: standard carbide endmills, long tool life\n"
-        "- Carbon steel: coated carbide, moderate life\n"
-        "- Stainless steel: premium coated carbide, frequent changes\n"
-        "- Titanium / Inconel: specialty inserts (ceramic, CBN), "
-        "aggressive replacement schedules"
-    )
-
-    st.markdown("#### Heat management and coolant")
-    st.markdown(
-        "Cutting generates heat. Materials with low thermal conductivity "
-        "(titanium, Inconel) concentrate heat at the tool tip, "
-        "accelerating wear. Effective coolant delivery — especially "
-        "high-pressure through-spindle coolant — becomes mandatory for "
-        "these materials, adding machine capability requirements and cost."
-    )
-
-    st.markdown("#### Work hardening")
-    st.markdown(
-        "Austenitic stainless steels (304, 316) and some nickel alloys "
-        "work-harden rapidly. If the tool rubs instead of cutting — due "
-        "to dull edges, light feeds, or poor rigidity — the surface "
-        "hardens and becomes even more difficult to machine. This creates "
-        "a vicious cycle of accelerating tool wear and degrading surface "
-        "finish."
-    )
-
-    st.markdown("#### Scrap risk and rework sensitivity")
-    st.markdown(
-        "Expensive stock (titanium, Inconel, 7075) makes scrap costly. "
-        "Difficult-to-machine materials also leave less margin for rework "
-        "— a scrapped titanium billet can represent hundreds of dollars in "
-        "material alone, before any machine time is accounted for."
-    )
-
-    st.markdown("#### Inspection overhead")
-    st.markdown(
-        "Tighter tolerances in harder materials mean more in-process "
-        "checks, CMM time, and potential first-article inspection (FAI) "
-        "requirements. Aerospace and medical materials (Ti-6Al-4V, "
-        "Inconel 718) almost always carry traceability and certification "
-        "requirements that add administrative cost."
-    )
+    st.markdown(page_md["cost_factors"])
 
     # ------------------------------------------------------------------
     # B. Material quick reference
@@ -1604,20 +2216,11 @@ elif page == "Learn — Materials":
 
     learn_material = st.selectbox("Material", MATERIALS, key="learn_material")
 
-    mat_info = MATERIAL_KB.get(learn_material)
-    if mat_info:
-        st.markdown(f"**Difficulty:** {mat_info['difficulty']}")
-        st.write(mat_info["machining_reality"])
-
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("**Cost drivers**")
-            for item in mat_info["cost_drivers"]:
-                st.markdown(f"- {item}")
-        with col2:
-            st.markdown("**Quote implications**")
-            for item in mat_info["quote_implications"]:
-                st.markdown(f"- {item}")
+    rendered = MATERIAL_RENDERED.get(learn_material)
+    if rendered:
+        st.markdown(rendered["reality_md"])
+
+        st.markdown(rendered["columns_html"], unsafe_allow_html=True)
 
     # ------------------------------------------------------------------
     # C. Rule-of-thumb takeaways
@@ -1625,23 +2228,7 @@ elif page == "Learn — Materials":
     st.markdown("---")
     st.header("Rule-of-thumb takeaways")
 
-    _takeaways = [
-        "6061 aluminum is the safest default — it's forgiving, fast to cut, and cheap to quote.",
-        "7075 is stronger than 6061 but less tolerant of thin walls and residual stress.",
-        "Low-carbon steel (1018) is gummy — keep feeds aggressive to avoid work hardening and built-up edge.",
-        "4140 pre-hard (28–32 HRC) is manageable; above 40 HRC, expect a significant cost jump.",
-        "Stainless work-hardens — keep tools sharp, feeds engaged, and never let the cutter rub.",
-        "Titanium and Inconel punish tooling and reward conservative speeds with aggressive depth of cut.",
-        "Harder materials amplify every setup weakness: rigidity, workholding, and runout all matter more.",
-        "Through-spindle coolant is a nice-to-have for steel, but mandatory for titanium and Inconel.",
-        "Material cost matters twice: once for the stock, and again if you scrap it.",
-        "Always ask for material condition (temper, hardness, heat treat state) — it changes the quote more than alloy alone.",
-        "If the customer says 'stainless' without specifying a grade, assume 304 and ask — 17-4 PH and 316 are very different jobs.",
-        "When tolerances are tight on hard materials, plan for a finish pass and budget CMM time.",
-    ]
-
-    for item in _takeaways:
-        st.markdown(f"- {item}")
+    st.markdown(page_md["takeaways"])
 
     # ------------------------------------------------------------------
     # D. What to ask customers
@@ -1649,49 +2236,25 @@ elif page == "Learn — Materials":
     st.markdown("---")
     st.header("What to ask customers")
 
-    st.markdown("#### Material spec & condition")
-    st.markdown(
-        "- Exact alloy and grade (e.g., 6061-T6, 304L, Ti-6Al-4V)\n"
-        "- Temper or hardness condition (annealed, pre-hard, aged)\n"
-        "- Applicable material standard (AMS, ASTM, DIN, JIS)\n"
-        "- Material certification or mill cert requirements"
-    )
+    st.markdown(page_md["ask_customers"])
 
-    st.markdown("#### Stock form")
-    st.markdown(
-        "- Plate, bar, round, tube, forging, or billet\n"
-        "- Near-net-shape or oversized stock\n"
-        "- Customer-furnished material (CFM) or shop-procured"
-    )
 
-    st.markdown("#### Quantity & lead time")
-    st.markdown(
-        "- Prototype vs production quantity\n"
-        "- Required delivery date or lead time window\n"
-        "- Blanket order or one-time run\n"
-        "- Any material lead time concerns (long-lead alloys)"
-    )
-
-    st.markdown("#### Critical tolerances / datums / GD&T")
-    st.markdown(
-        "- Tightest dimensional tolerance on the part\n"
-        "- Key datums and datum reference frames\n"
-        "- Any GD&T callouts (true position, profile, runout)\n"
-        "- Whether tolerances are pre- or post-heat-treat"
-    )
-
-    st.markdown("#### Surface finish, coatings, heat treat, special processes")
-    st.markdown(
-        "- Surface finish requirements (Ra / Rz callouts)\n"
-        "- Coatings (anodize, plating, PVD, paint)\n"
-        "- Heat treat (quench & temper, age hardening, stress relief)\n"
-        "- Special processes (passivation, shot peening, NDT)"
-    )
+# ---------------------------------------------------------------------------
+# Sidebar navigation
+# ---------------------------------------------------------------------------
+PAGES = {
+    "Analyze": _page_analyze,
+    "Learn — Formats": _page_learn_formats,
+    "Learn — Materials": _page_learn_materials,
+}
 
-    st.markdown("#### Inspection requirements")
-    st.markdown(
-        "- First Article Inspection (FAI) per AS9102 or equivalent\n"
-        "- CMM dimensional report\n"
-        "- Material certs and traceability\n"
-        "- Any customer-specific quality clauses or QMS requirements"
-    )
+st.sidebar.title("CAD File Profiler")
+page = st.sidebar.radio("Navigate", list(PAGES))
+if st.sidebar.button(
+    "Clear cached results", help="Re-parse uploads instead of reusing cached metrics."
+):
+    parse_mesh_metrics.clear()
+    parse_dxf_metrics.clear()
+    st.session_state.pop("_parsed_upload", None)
+_scroll_to_top(page)
+PAGES[page]()